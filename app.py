@@ -1,14 +1,27 @@
 import os
+import io
+import json
 import tempfile
 import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from flask import Flask, request, render_template, send_file, flash, redirect, url_for, after_this_request
-import pdfplumber
-from groq import Groq
+from flask import Flask, Request, request, render_template, send_file, flash, redirect, url_for, jsonify, Response
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, black, gray
+import metrics
+from extraction import PDF_BACKENDS, extract_text, warm_process_pool
+from groq_client import GroqPool
+from jobs import JobStore, JobWorkerPool, DONE, FAILED
+from layout import PageChrome, preload_fonts, split_bold, wrap_runs, draw_runs
+from preprocess import compress_resume, estimate_tokens, extract_contacts
+from ratelimit import RateLimiter
+from routing import Cancelled, ModelRouter
+from result_cache import ResultCache
 
 # Load environment variables for local development
 try:
@@ -19,156 +32,607 @@ except ImportError:
 
 # ================= CONFIGURATION =================
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_MODEL = "llama-3.3-70b-versatile"
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+# Smaller model for short resumes, tight latency budgets and hedging slow primary calls ("" disables)
+GROQ_FAST_MODEL = os.getenv("GROQ_FAST_MODEL", "llama-3.1-8b-instant")
+FAST_MODEL_MAX_TOKENS = int(os.getenv("FAST_MODEL_MAX_TOKENS", 300))
+# Seconds before a still-running primary call is hedged with the fast model (0 disables)
+LLM_LATENCY_SLO = float(os.getenv("LLM_LATENCY_SLO", 20))
+model_router = ModelRouter(GROQ_MODEL, GROQ_FAST_MODEL, fast_max_tokens=FAST_MODEL_MAX_TOKENS, slo_seconds=LLM_LATENCY_SLO)
+GROQ_POOL_SIZE = int(os.getenv("GROQ_POOL_SIZE", 10))
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", 5))
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", 60))
+GROQ_KEEPALIVE_SECONDS = float(os.getenv("GROQ_KEEPALIVE_SECONDS", 60))
+# Retries are left to groq_limiter, which also knows to wait out rate limits
+groq_pool = GroqPool(GROQ_API_KEY, pool_size=GROQ_POOL_SIZE, connect_timeout=GROQ_CONNECT_TIMEOUT,
+                     read_timeout=GROQ_TIMEOUT, keepalive_seconds=GROQ_KEEPALIVE_SECONDS, max_retries=0)
+# Resume text sent to the model, in (estimated) tokens, after compression by preprocess.compress_resume
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 1000))
+# Extraction stops once this many characters are collected; compression then picks what to keep
+EXTRACT_CHAR_BUDGET = int(os.getenv("EXTRACT_CHAR_BUDGET", 20000))
+# Extract every page even past the extraction budget (e.g. for long portfolio PDFs)
+LONG_DOCUMENT_MODE = os.getenv("LONG_DOCUMENT_MODE", "0") == "1"
+# Worker processes for whole-document PDF extraction (0 disables) and the page count that makes it worthwhile
+EXTRACT_PROCESSES = int(os.getenv("EXTRACT_PROCESSES", min(4, os.cpu_count() or 1)))
+PARALLEL_EXTRACT_MIN_PAGES = int(os.getenv("PARALLEL_EXTRACT_MIN_PAGES", 8))
+# PDF text extractor: "auto" probes each document, or force one of extraction.PDF_BACKENDS
+PDF_EXTRACTOR = os.getenv("PDF_EXTRACTOR", "auto")
+if PDF_EXTRACTOR != "auto" and PDF_EXTRACTOR not in PDF_BACKENDS:
+    print(f"Config Error: unknown PDF_EXTRACTOR {PDF_EXTRACTOR!r}, using auto")
+    PDF_EXTRACTOR = "auto"
+# "json" asks Groq for a JSON object validated per field (missing fields are re-requested on their own);
+# "text" streams the line format so job progress can report sections as they complete
+LLM_OUTPUT_FORMAT = os.getenv("LLM_OUTPUT_FORMAT", "text")
+JSON_FOLLOWUP_REQUESTS = int(os.getenv("JSON_FOLLOWUP_REQUESTS", 1))
+# Split extraction into concurrent sub-prompts (contact + summary, experience, projects, skills) so the
+# model call takes as long as the slowest section rather than one long reply
+LLM_SECTIONED = os.getenv("LLM_SECTIONED", "0") == "1"
+# Job descriptions are cut to this many characters in the tailoring prompt
+JOB_DESCRIPTION_CHARS = int(os.getenv("JOB_DESCRIPTION_CHARS", 3000))
+# Contact fields found locally with at least this confidence are left out of the prompt;
+# weaker guesses only fill fields the model leaves blank
+CONTACT_CONFIDENCE = float(os.getenv("CONTACT_CONFIDENCE", 0.85))
+CONTACT_FALLBACK_CONFIDENCE = 0.5
+# Bump whenever the prompt or PDF layout changes so cached results are not reused
+PROMPT_VERSION = "v6"
+
+class SpooledRequest(Request):
+    """Keep uploads in memory unless the request exceeds UPLOAD_SPOOL_BYTES, as werkzeug does at 500 KB.
+
+    Not SpooledTemporaryFile: before Python 3.11 it has no readinto or seekable,
+    which pypdfium2 and zipfile need.
+    """
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is not None and total_content_length <= UPLOAD_SPOOL_BYTES:
+            return io.BytesIO()
+        return tempfile.TemporaryFile("rb+")
 
 app = Flask(__name__)
+app.request_class = SpooledRequest
 app.secret_key = os.getenv("SECRET_KEY", "hr-resume-converter-2026")
 TEMP_DIR = tempfile.gettempdir()
 
-# ================= HELPERS =================
-def extract_text(path):
-    """Extract text from PDF or DOCX"""
-    text = ""
-    try:
-        if path.lower().endswith(".pdf"):
-            with pdfplumber.open(path) as pdf:
-                for page in pdf.pages:
-                    text += (page.extract_text() or "") + "\n"
-        else:
-            # Fallback for DOCX text extraction without python-docx
-            import zipfile
-            import xml.etree.ElementTree as ET
-            with zipfile.ZipFile(path) as docx:
-                xml_content = docx.read('word/document.xml')
-                tree = ET.fromstring(xml_content)
-                namespace = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-                for paragraph in tree.findall('.//w:p', namespace):
-                    texts = [node.text for node in paragraph.findall('.//w:t', namespace) if node.text]
-                    if texts:
-                        text += "".join(texts) + "\n"
-    except Exception as e:
-        print(f"Extraction Error: {e}")
-    return text.strip()
+# Result cache (shared by all workers on the host)
+CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(TEMP_DIR, "resume_cache", "results.sqlite3"))
+CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", 200))
+CACHE_MAX_AGE_HOURS = float(os.getenv("RESULT_CACHE_MAX_AGE_HOURS", 24 * 7))
+result_cache = ResultCache(CACHE_PATH, int(CACHE_MAX_MB * 1024 * 1024), CACHE_MAX_AGE_HOURS * 3600)
 
-def get_ai_data(resume_text):
-    """Get structured data from Groq AI"""
-    if not GROQ_API_KEY:
-        print("API Key missing!")
-        return None
+# Uploads
+ALLOWED_EXTENSIONS = (".pdf", ".docx")
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+# Uploads up to this size never touch the disk (werkzeug's default spills anything over 500 KB)
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", 16 * 1024 * 1024))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", 500))
+# Uncompressed bytes accepted per batch, across all files and archive entries
+BATCH_MAX_BYTES = int(float(os.getenv("BATCH_MAX_MB", 200)) * 1024 * 1024)
+# Job descriptions accepted by /convert/multi; each is tailored on its own thread
+MULTI_MAX_JOBS = int(os.getenv("MULTI_MAX_JOBS", 10))
 
-    prompt = f"""Extract professional details from this resume.
+# Background jobs (queue shared by all workers on the host)
+JOBS_PATH = os.getenv("JOBS_DB_PATH", os.path.join(TEMP_DIR, "resume_cache", "jobs.sqlite3"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_TTL_HOURS = float(os.getenv("JOB_TTL_HOURS", 24))
+JOB_EVENTS_POLL_SECONDS = 0.5
+JOB_EVENTS_TIMEOUT = 600
+job_store = JobStore(JOBS_PATH, ttl_seconds=JOB_TTL_HOURS * 3600)
+
+# Groq rate limits, tracked for all workers on the host; 0 = learn them from response headers only
+RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_DB_PATH", os.path.join(TEMP_DIR, "resume_cache", "ratelimit.sqlite3"))
+GROQ_RPM = int(os.getenv("GROQ_RPM", 0))
+GROQ_TPM = int(os.getenv("GROQ_TPM", 0))
+GROQ_QUEUE_TIMEOUT = float(os.getenv("GROQ_QUEUE_TIMEOUT", 120))
+GROQ_RETRIES = int(os.getenv("GROQ_RETRIES", 5))
+# Completion tokens charged against the budget up front; the next response's headers correct it
+COMPLETION_TOKENS_ESTIMATE = 1500
+TAILOR_TOKENS_ESTIMATE = 300
+groq_limiter = RateLimiter(RATE_LIMIT_PATH, rpm=GROQ_RPM, tpm=GROQ_TPM, max_wait=GROQ_QUEUE_TIMEOUT, retries=GROQ_RETRIES)
+
+# ================= HELPERS =================
+PROMPT_RULES = """Extract professional details from this resume.
 STRICT RULES:
 1. ONLY use details from the text.
 2. If missing, leave empty.
 3. Separate Technical and Soft skills.
-4. Professional Title should be JUST the job title (e.g. "Java Developer").
+4. Professional Title should be JUST the job title (e.g. "Java Developer")."""
 
-FORMAT:
-CANDIDATE INFORMATION:
-- Full Name:
-- Professional Title:
-- Email:
-- Phone:
-- Location:
+# The pipeline is written once, as generators that yield steps (a model call, blocking work, a routed
+# call, sub-steps to run concurrently) and are sent each step's result. run_steps performs them on the
+# calling thread; asgi.run_steps awaits them on the event loop. Nothing else differs between the two.
+def _llm(model, prompt, completion_tokens, on_delta=None, **kwargs):
+    """A Groq call; with on_delta the reply is streamed to it and the step's result is None"""
+    return ("llm", model, prompt, completion_tokens, on_delta, kwargs)
 
-PROFILE SUMMARY:
-(Short summary)
+def _blocking(fn, *args):
+    """fn(*args): file, SQLite or CPU work that must not run on the event loop"""
+    return ("blocking", fn, args)
 
-PROFESSIONAL EXPERIENCE:
-(Format: Company | Role | Duration | Responsibilities)
+def _route(steps_for, tokens, latency_budget=None, report=None):
+    """model_router picks (and maybe hedges) the model; steps_for(model, lead) are the steps for one call"""
+    return ("route", steps_for, tokens, latency_budget, report)
 
-PROJECT EXPERIENCE:
-(Projects and tech used)
+def _gather(parts):
+    """Run several step generators concurrently; the result is their results, in order"""
+    return ("gather", parts)
 
-TECHNICAL SKILLS:
-(Tools, languages, etc.)
+def run_steps(steps, cancel=None):
+    """Run a step generator on this thread; cancel (an Event) stops it at its next model call or streamed chunk"""
+    value, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error else steps.send(value)
+        except StopIteration as done:
+            return done.value
+        value, error = None, None
+        try:
+            value = _perform(step, cancel)
+        except Exception as e:
+            error = e
 
-SOFT SKILLS:
-(Communication, etc.)
+def _perform(step, cancel):
+    kind, *args = step
+    if kind == "blocking":
+        fn, fn_args = args
+        return fn(*fn_args)
+    if kind == "llm":
+        return _call_llm(cancel, *args)
+    if kind == "route":
+        steps_for, tokens, latency_budget, report = args
+        return model_router.run(lambda model, cancel, lead: run_steps(steps_for(model, lead), cancel),
+                                tokens, latency_budget, report)
+    if kind == "gather":
+        parts = args[0]
+        with ThreadPoolExecutor(max_workers=len(parts) or 1) as pool:
+            return list(pool.map(lambda part: run_steps(part, cancel), parts))
+    raise ValueError(f"unknown step {kind!r}")
+
+def _call_llm(cancel, model, prompt, completion_tokens, on_delta, kwargs):
+    if cancel is not None and cancel.is_set():
+        raise Cancelled(model)
+    if on_delta is not None:
+        kwargs = dict(kwargs, stream=True)
+    response = groq_limiter.create(groq_pool.client(), estimate_tokens(prompt) + completion_tokens, model=model,
+                                   messages=[{"role": "user", "content": prompt}], **kwargs)
+    if on_delta is None:
+        return response
+    for chunk in response:
+        if cancel is not None and cancel.is_set():
+            response.close()
+            raise Cancelled(model)
+        delta = _chunk_text(chunk)
+        if delta:
+            on_delta(delta)
+
+def get_ai_data(resume_text, job_description="", progress=None, latency_budget=None, report=None):
+    """Get structured data from Groq AI, tailored to job_description when one is given.
+
+    Phase 1 extracts the resume independently of any job and is cached per
+    resume text; phase 2 (tailor_data) is a small prompt that only rewrites the
+    summary and skill emphasis, so re-tailoring a known candidate is cheap.
+    model_router picks the model; report (a dict) receives the model, tier and
+    reason it was chosen, and whether the call was hedged.
+    """
+    return run_steps(_ai_data_steps(resume_text, job_description, progress, latency_budget, report))
+
+def _ai_data_steps(resume_text, job_description="", progress=None, latency_budget=None, report=None):
+    if not GROQ_API_KEY:
+        print("API Key missing!")
+        return None
+
+    data = yield from _extract_steps(resume_text, progress, latency_budget, report)
+    if data and job_description:
+        with metrics.timed("tailor"):
+            data = yield from _tailor_steps(data, job_description, latency_budget, report)
+    return data
+
+def _extract_steps(resume_text, progress=None, latency_budget=None, report=None):
+    """Phase 1: the job-description-agnostic record, from the extraction cache when this text was seen before"""
+    # A scanned or empty document would only get a made-up record back, which would then be cached
+    if not resume_text.strip(): raise ConversionError("no text could be extracted from the resume")
+    report = {} if report is None else report
+    cache_key = _extraction_key(resume_text)
+    cached = yield _blocking(result_cache.get_data, cache_key)
+    metrics.EXTRACTION_CACHE_LOOKUPS.labels("hit" if cached else "miss").inc()
+    if cached:
+        report.update(tier="cache", reason="extraction_cache", hedged=False)
+        return cached
+
+    contacts, known = _local_contacts(resume_text)
+    fields = [key for key in ALL_FIELDS if key not in known]
+    fetch = _sectioned_steps if LLM_SECTIONED else _json_steps if LLM_OUTPUT_FORMAT == "json" else _text_steps
+
+    def steps_for(model, lead):
+        # Only the call that started first reports progress; a hedge racing it stays quiet
+        return fetch(resume_text, fields, model, progress if lead else None)
 
-TEXT:
-{resume_text[:4000]}
-"""
     try:
-        client = Groq(api_key=GROQ_API_KEY)
-        resp = client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2
-        )
-        return parse_ai_response(resp.choices[0].message.content)
+        data = yield _route(steps_for, estimate_tokens(resume_text), latency_budget, report)
     except Exception as e:
         print(f"AI Error: {e}")
+        metrics.CONVERSIONS.labels("llm_error").inc()
         return None
+    _merge_contacts(data, contacts, known)
+    if _cacheable(report):
+        yield _blocking(result_cache.put_data, cache_key, data)
+    return data
 
-def parse_ai_response(text):
-    """Parse AI output into dictionary"""
-    data = {
-        "Full Name": "", "Professional Title": "", "Email": "", "Phone": "", "Location": "",
-        "Profile Summary": "", "Professional Experience": "", "Project Experience": "",
-        "Technical Skills": "", "Soft Skills": ""
+def _extraction_key(resume_text):
+    """Extraction cache key: the prompt text plus every setting that changes the record"""
+    return ResultCache.key(resume_text.encode("utf-8"), GROQ_MODEL, GROQ_FAST_MODEL, FAST_MODEL_MAX_TOKENS,
+                           PROMPT_VERSION, CONTACT_CONFIDENCE, LLM_OUTPUT_FORMAT, LLM_SECTIONED)
+
+# Routing reasons that depend only on the input and the settings in the cache keys; a hedge,
+# fallback or budget pick depends on load, and caching it would pin that model's answer
+CACHEABLE_REASONS = {"default", "small_input", "cache", "extraction_cache"}
+
+def _cacheable(report, tailored=False):
+    """True if every model call behind a result (extraction, and tailoring if tailored) may be cached"""
+    reports = [report, report.get("tailor", {})] if tailored else [report]
+    return all(item.get("reason") in CACHEABLE_REASONS and not item.get("incomplete") for item in reports)
+
+def _local_contacts(resume_text):
+    """(all local contact guesses, the ones confident enough to leave out of the prompt)"""
+    contacts = extract_contacts(resume_text)
+    known = {key: value for key, (value, confidence) in contacts.items() if value and confidence >= CONTACT_CONFIDENCE}
+    return contacts, known
+
+def _merge_contacts(data, contacts, known):
+    for key, (value, confidence) in contacts.items():
+        if key in known:
+            data[key] = value
+            metrics.CONTACT_FIELDS.labels(key, "local").inc()
+        elif data[key]:
+            metrics.CONTACT_FIELDS.labels(key, "model").inc()
+        elif value and confidence >= CONTACT_FALLBACK_CONFIDENCE:
+            # The model left it blank; a weaker local guess beats an empty header
+            data[key] = value
+            metrics.CONTACT_FIELDS.labels(key, "fallback").inc()
+
+# Phase 2 only rewrites these; everything else comes from the cached extraction as is
+TAILOR_FIELDS = ["Profile Summary", "Technical Skills"]
+
+def tailor_data(data, job_description, latency_budget=None, report=None):
+    """Phase 2: rewrite the summary and skill emphasis of an extracted record for one job description.
+
+    Returns a new dict; if the tailoring call fails the untailored record is used.
+    """
+    return run_steps(_tailor_steps(data, job_description, latency_budget, report))
+
+def _tailor_steps(data, job_description, latency_budget=None, report=None):
+    prompt = _tailor_prompt(data, job_description)
+
+    def steps_for(model, lead):
+        response = yield _llm(model, prompt, TAILOR_TOKENS_ESTIMATE, temperature=0.3, response_format={"type": "json_object"})
+        metrics.record_usage(getattr(response, "usage", None))
+        return response.choices[0].message.content
+
+    try:
+        route = {}
+        reply = yield _route(steps_for, estimate_tokens(prompt), latency_budget, route)
+        if report is not None:
+            report["tailor"] = route
+    except Exception as e:
+        print(f"Tailor Error: {e}")
+        return dict(data)
+    tailored, missing = _apply_tailoring(data, reply)
+    # Left (partly) untailored: fine to serve once, but not as this job description's cached PDF
+    route["incomplete"] = bool(missing)
+    return tailored
+
+def _tailor_prompt(data, job_description):
+    # The model sees the record's headline facts, not the whole resume
+    resume = {
+        "Professional Title": data["Professional Title"],
+        "Profile Summary": data["Profile Summary"],
+        "Technical Skills": data["Technical Skills"],
+        "Roles": [line.strip() for line in data["Professional Experience"].splitlines() if "|" in line],
     }
-    
-    current_key = None
-    for line in text.split("\n"):
+    example = json.dumps({key: JSON_EXAMPLE[key] for key in TAILOR_FIELDS}, indent=1)
+    return f"""Tailor this candidate's resume to the job description.
+
+STRICT RULES:
+1. ONLY use facts from the resume; never add skills or experience the candidate does not have.
+2. Profile Summary: 2-3 sentences aimed at the role, using the job's keywords where they are true of the candidate. Wrap matching skills in **double asterisks**.
+3. Technical Skills: the same skills, reordered so the ones the job asks for come first.
+4. Reply with ONLY a JSON object with exactly these keys:
+{example}
+
+RESUME:
+{json.dumps(resume, indent=1)}
+
+JOB DESCRIPTION:
+{job_description[:JOB_DESCRIPTION_CHARS]}
+"""
+
+def _apply_tailoring(data, reply):
+    """(a copy of data with the tailored fields from a JSON reply, the fields it left out or empty).
+
+    A field that is left out or empty keeps the extracted text.
+    """
+    values, missing = parse_json_response(reply, TAILOR_FIELDS)
+    missing += [key for key, value in values.items() if not value]
+    if missing:
+        print(f"Tailor Error: reply has no {', '.join(missing)}; keeping the extracted text")
+    tailored = dict(data)
+    tailored.update({key: value for key, value in values.items() if value})
+    return tailored, missing
+
+def _text_steps(resume_text, fields, model, progress=None):
+    """Line-oriented reply, streamed so sections are parsed as they arrive"""
+    parser = ResponseParser()
+    parse_seconds = 0.0
+
+    def on_delta(delta):
+        nonlocal parse_seconds
+        start = time.perf_counter()
+        closed = parser.feed(delta)
+        parse_seconds += time.perf_counter() - start
+        if closed and progress:
+            progress(stage="ai", sections=list(parser.completed))
+
+    yield _llm(model, _text_prompt(resume_text, fields), COMPLETION_TOKENS_ESTIMATE, on_delta, temperature=0.2)
+    start = time.perf_counter()
+    data = parser.close()
+    metrics.observe("parse", parse_seconds + time.perf_counter() - start)
+    return data
+
+def _text_prompt(resume_text, fields):
+    blocks = []
+    contact = [key for _, key in CONTACT_FIELDS if key in fields]
+    if contact:
+        blocks.append("CANDIDATE INFORMATION:\n" + "\n".join(f"- {key}:" for key in contact))
+    blocks += [f"{key.upper()}:\n{SECTION_HINTS[key]}" for _, key in SECTION_HEADINGS if key in fields]
+    layout = "\n\n".join(blocks)
+    return f"""{PROMPT_RULES}
+
+FORMAT:
+{layout}
+
+TEXT:
+{resume_text}
+"""
+
+def _chunk_text(chunk):
+    """Text delta of a streamed chunk; Groq reports token usage on the final one"""
+    metrics.record_usage(getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None))
+    return chunk.choices[0].delta.content if chunk.choices else None
+
+# Shown to the model as the shape of the JSON reply; sections are lists of lines in the text format
+JSON_EXAMPLE = {
+    "Full Name": "", "Professional Title": "", "Email": "", "Phone": "", "Location": "",
+    "Profile Summary": ["short summary"],
+    "Professional Experience": ["Company | Role | Duration", "- responsibility"],
+    "Project Experience": ["Project Name: ...", "Technologies: ...", "- responsibility"],
+    "Technical Skills": ["tools, languages, etc."],
+    "Soft Skills": ["communication, etc."],
+}
+
+def _json_steps(resume_text, fields, model, progress=None):
+    """JSON-mode reply validated field by field; fields missing or malformed are re-requested on their own"""
+    data = {key: "" for key in ALL_FIELDS}
+    for attempt in range(JSON_FOLLOWUP_REQUESTS + 1):
+        if not fields: break
+        if attempt:
+            metrics.LLM_FOLLOWUPS.inc()
+        response = yield _llm(model, _json_prompt(resume_text, fields), COMPLETION_TOKENS_ESTIMATE,
+                              temperature=0.2, response_format={"type": "json_object"})
+        metrics.record_usage(getattr(response, "usage", None))
+        start = time.perf_counter()
+        values, fields = parse_json_response(response.choices[0].message.content, fields)
+        metrics.observe("parse", time.perf_counter() - start)
+        data.update(values)
+        if progress:
+            progress(stage="ai", sections=[key for _, key in SECTION_HEADINGS if data[key]])
+    if fields:
+        print(f"AI Warning: no valid value for {', '.join(fields)}")
+    return data
+
+def _json_prompt(resume_text, fields):
+    example = json.dumps({key: JSON_EXAMPLE[key] for key in fields}, indent=1)
+    return f"""{PROMPT_RULES}
+5. Reply with ONLY a JSON object with exactly these keys, "" or [] when missing:
+{example}
+
+TEXT:
+{resume_text}
+"""
+
+def _sectioned_steps(resume_text, fields, model, progress=None):
+    """LLM_SECTIONED: one concurrent sub-prompt per SECTION_GROUPS entry, merged into a single record"""
+    fetch = _json_steps if LLM_OUTPUT_FORMAT == "json" else _text_steps
+    finished = {}
+    lock = threading.Lock()
+
+    def section(name, keys):
+        def report(stage, sections):
+            # Each sub-prompt only knows its own sections; job progress shows them all
+            with lock:
+                finished[name] = sections
+                done = {key for sections in finished.values() for key in sections}
+            progress(stage=stage, sections=[key for _, key in SECTION_HEADINGS if key in done])
+
+        start = time.perf_counter()
+        part = yield from fetch(resume_text, keys, model, report if progress else None)
+        metrics.LLM_SECTION_SECONDS.labels(name).observe(time.perf_counter() - start)
+        if progress:
+            report("ai", [key for key in keys if key not in CONTACT_KEYS and part[key]])
+        return {key: part[key] for key in keys}
+
+    data = {key: "" for key in ALL_FIELDS}
+    for part in (yield _gather([section(name, keys) for name, keys in _section_groups(fields)])):
+        data.update(part)
+    return data
+
+def _section_groups(fields):
+    """SECTION_GROUPS limited to the requested fields, dropping groups left empty"""
+    groups = [(name, [key for key in keys if key in fields]) for name, keys in SECTION_GROUPS]
+    return [(name, keys) for name, keys in groups if keys]
+
+CONTACT_FIELDS = [
+    ("full name:", "Full Name"),
+    ("professional title:", "Professional Title"),
+    ("email:", "Email"),
+    ("phone:", "Phone"),
+    ("location:", "Location"),
+]
+SECTION_HEADINGS = [
+    ("profile summary:", "Profile Summary"),
+    ("professional experience:", "Professional Experience"),
+    ("project experience:", "Project Experience"),
+    ("technical skills:", "Technical Skills"),
+    ("soft skills:", "Soft Skills"),
+]
+ALL_FIELDS = [key for _, key in CONTACT_FIELDS + SECTION_HEADINGS]
+# What the text format asks for under each heading
+SECTION_HINTS = {
+    "Profile Summary": "(Short summary)",
+    "Professional Experience": "(Format: Company | Role | Duration | Responsibilities)",
+    "Project Experience": "(Projects and tech used)",
+    "Technical Skills": "(Tools, languages, etc.)",
+    "Soft Skills": "(Communication, etc.)",
+}
+# LLM_SECTIONED sub-prompts; each group is one request, issued concurrently
+SECTION_GROUPS = [
+    ("contact", [key for _, key in CONTACT_FIELDS] + ["Profile Summary"]),
+    ("experience", ["Professional Experience"]),
+    ("projects", ["Project Experience"]),
+    ("skills", ["Technical Skills", "Soft Skills"]),
+]
+CONTACT_KEYS = {key for _, key in CONTACT_FIELDS}
+# Bullets, markdown and numbering the model sometimes puts in front of field names and headings
+LINE_MARKUP = "-*#•· \t"
+LINE_PREFIX = re.compile(rf"^[{re.escape(LINE_MARKUP)}]*(?:\d+[.)])?[{re.escape(LINE_MARKUP)}]*")
+
+def _section_heading(lower_line):
+    """The section a (prefix-stripped, lowercase) line opens, if it is a heading; the colon is optional"""
+    for marker, key in SECTION_HEADINGS:
+        if lower_line.startswith(marker) or lower_line.rstrip(LINE_MARKUP + ":") == marker[:-1]:
+            return key
+    return None
+
+class ResponseParser:
+    """Incremental parser for the AI output: feed streamed chunks, sections fill in as lines arrive"""
+    def __init__(self):
+        self.data = {key: "" for _, key in CONTACT_FIELDS}
+        self.data.update({key: "" for _, key in SECTION_HEADINGS})
+        self.sections = {key: [] for _, key in SECTION_HEADINGS}
+        self.completed = []
+        self.current_key = None
+        self._in_body = False
+        self._pending = ""
+
+    def feed(self, chunk):
+        """Consume a chunk; returns True when a section was closed by it"""
+        before = len(self.completed)
+        *lines, self._pending = (self._pending + chunk).split("\n")
+        for line in lines:
+            self._line(line)
+        return len(self.completed) > before
+
+    def _line(self, line):
         line = line.strip()
-        if not line: continue
+        if not line: return
         
-        lower_line = line.lower()
-        if "full name:" in lower_line: data["Full Name"] = line.split(":", 1)[1].strip(); continue
-        if "professional title:" in lower_line: data["Professional Title"] = line.split(":", 1)[1].strip(); continue
-        if "email:" in lower_line: data["Email"] = line.split(":", 1)[1].strip(); continue
-        if "phone:" in lower_line: data["Phone"] = line.split(":", 1)[1].strip(); continue
-        if "location:" in lower_line: data["Location"] = line.split(":", 1)[1].strip(); continue
+        # Markers must start the line, and only count before the body: "- Email: updates" there is content
+        lower_line = LINE_PREFIX.sub("", line.lower())
+        if not self._in_body:
+            for marker, key in CONTACT_FIELDS:
+                if lower_line.startswith(marker):
+                    self.data[key] = line.split(":", 1)[1].strip().strip("*").strip()
+                    return
         
-        sec_map = {
-            "profile summary:": "Profile Summary",
-            "professional experience:": "Professional Experience",
-            "project experience:": "Project Experience",
-            "technical skills:": "Technical Skills",
-            "soft skills:": "Soft Skills"
-        }
-        for k, v in sec_map.items():
-            if k in lower_line:
-                current_key = v
-                break
-        else:
-            if current_key:
-                data[current_key] += line + "\n"
-            
-    return {k: v.strip() for k, v in data.items()}
+        key = _section_heading(lower_line)
+        if key:
+            self._close_section()
+            self.current_key = key
+            self._in_body = True
+            return
+        if self.current_key:
+            self.sections[self.current_key].append(line)
+        # A label such as "CANDIDATE INFORMATION:" or a preamble ending in a colon still belongs to the header
+        if not lower_line.rstrip(LINE_MARKUP).endswith(":"):
+            self._in_body = True
+
+    def _close_section(self):
+        if self.current_key and self.current_key not in self.completed:
+            self.completed.append(self.current_key)
+
+    def close(self):
+        """Flush the last partial line and return the finished dictionary"""
+        self._line(self._pending)
+        self._pending = ""
+        self._close_section()
+        for key, lines in self.sections.items():
+            if lines:
+                self.data[key] = "\n".join(lines)
+        return {k: v.strip() for k, v in self.data.items()}
+
+def parse_ai_response(text):
+    """Parse AI output into dictionary"""
+    parser = ResponseParser()
+    parser.feed(text)
+    return parser.close()
+
+JSON_OBJECT = re.compile(r'\{.*\}', re.S)
+_MISSING = object()
+
+def _json_lines(value):
+    """Flatten a JSON value into text lines; objects the model nests anyway become 'a | b' plus '- item' lines"""
+    if value is None: return []
+    if isinstance(value, bool): raise ValueError("boolean field")
+    if isinstance(value, (str, int, float)): return [str(value)]
+    if isinstance(value, list):
+        return [line for item in value for line in _json_lines(item)]
+    if isinstance(value, dict):
+        head = " | ".join(str(v) for v in value.values() if isinstance(v, (str, int, float)) and not isinstance(v, bool) and v != "")
+        rest = [f"- {line}" for v in value.values() if isinstance(v, list) for line in _json_lines(v)]
+        return ([head] if head else []) + rest
+    raise ValueError(f"unexpected {type(value).__name__}")
+
+def parse_json_response(text, fields):
+    """Validate a JSON-mode reply in one pass: returns (values for the fields that are valid, fields still missing)"""
+    try:
+        reply = json.loads(text)
+    except (TypeError, ValueError):
+        # Repair chatter or code fences around the object
+        match = JSON_OBJECT.search(text or "")
+        try:
+            reply = json.loads(match.group(0)) if match else None
+        except ValueError:
+            reply = None
+    if not isinstance(reply, dict):
+        return {}, list(fields)
+
+    # Key names match loosely ("full_name", "FullName")
+    reply = {re.sub(r'[\s_]', '', str(k)).lower(): v for k, v in reply.items()}
+    values, missing = {}, []
+    for key in fields:
+        value = reply.get(key.replace(" ", "").lower(), _MISSING)
+        try:
+            if value is _MISSING: raise ValueError("absent")
+            lines = [line.strip() for line in _json_lines(value) if line.strip()]
+        except ValueError:
+            missing.append(key)
+            continue
+        values[key] = (" " if key in CONTACT_KEYS else "\n").join(lines)
+    return values, missing
+
+TEXT_COLORS = {"Helvetica": HexColor('#34495E'), "Helvetica-Bold": black}
+# Logo resolved and encoded once; re-read automatically if static/ changes
+page_chrome = PageChrome(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
 
 def create_resume_pdf(data, path):
-    """Generate PDF directly using ReportLab (Cross-Platform)"""
+    """Generate PDF directly using ReportLab (Cross-Platform); path may also be a binary file object"""
     c = canvas.Canvas(path, pagesize=A4)
     width, height = A4
     margin = 0.5 * inch
     
-    # 1. Page Border (Blue)
-    c.setStrokeColor(HexColor('#2980B9'))
-    c.setLineWidth(1)
-    c.rect(margin, margin, width - 2*margin, height - 2*margin)
-    
-    y = height - margin - 0.4*inch
-    
-    # 2. Logo (Centered)
-    static_dir = os.path.join(os.path.dirname(__file__), 'static')
-    logo_path = None
-    for ext in ['png', 'jpg', 'jpeg']:
-        lp = os.path.join(static_dir, f'krify_logo.{ext}')
-        if os.path.exists(lp):
-            logo_path = lp
-            break
-            
-    if logo_path:
-        logo_w, logo_h = 1.2*inch, 0.6*inch
-        c.drawImage(logo_path, (width - logo_w)/2, y - logo_h, width=logo_w, height=logo_h, preserveAspectRatio=True, mask='auto')
-        y -= logo_h + 0.3*inch
-    else:
-        c.setFont("Helvetica-Bold", 18)
-        c.setFillColor(HexColor('#003765'))
-        c.drawCentredString(width/2, y, "KRIFY")
-        y -= 0.5*inch
+    # 1. Page Border (Blue) + 2. Logo (Centered), shared forms prepared once per process
+    logo_block = page_chrome.define_forms(c, width, height, margin)
+    c.doForm("border")
+    c.doForm("logo")
+    y = height - margin - 0.4*inch - logo_block
 
     # 3. Name & Title
     name = data["Full Name"].upper()
@@ -211,8 +675,7 @@ def create_resume_pdf(data, path):
             if y < margin + 1*inch: # New Page
                 c.showPage()
                 # Re-add border on new page
-                c.setStrokeColor(HexColor('#2980B9'))
-                c.rect(margin, margin, width-2*margin, height-2*margin)
+                c.doForm("border")
                 y = height - margin - 0.5*inch
                 c.setFont("Helvetica", 10)
                 c.setFillColor(HexColor('#34495E'))
@@ -223,25 +686,21 @@ def create_resume_pdf(data, path):
             # Simple bullet handling
             indent = margin + 0.3*inch
             if line.startswith(('-', '•')):
+                c.setFont("Helvetica", 10)
+                c.setFillColor(TEXT_COLORS["Helvetica"])
                 c.drawString(indent, y, "•")
                 indent += 0.15*inch
                 line = line[1:].strip()
             
-            # Wrap text manually
-            words = line.split()
-            current_line = []
-            for word in words:
-                test_line = " ".join(current_line + [word])
-                if c.stringWidth(test_line, "Helvetica", 10) < (width - margin*2 - 0.6*inch):
-                    current_line.append(word)
-                else:
-                    c.drawString(indent, y, " ".join(current_line))
+            # Wrap with running widths; **bold** runs keep their own font
+            wrapped = wrap_runs(split_bold(line), width - margin*2 - 0.6*inch, 10)
+            for i, runs in enumerate(wrapped):
+                if i:
                     y -= 0.22*inch
-                    current_line = [word]
                     if y < margin + 0.5*inch: break
+                draw_runs(c, indent, y, runs, 10, TEXT_COLORS)
             
-            if current_line:
-                c.drawString(indent, y, " ".join(current_line))
+            if wrapped:
                 y -= 0.3*inch # Increased space between matter/paragraphs
 
     add_section("PROFILE SUMMARY", data["Profile Summary"])
@@ -251,52 +710,519 @@ def create_resume_pdf(data, path):
     add_section("SOFT SKILLS", data["Soft Skills"])
 
     # 5. Footer (Left aligned)
-    c.setFont("Helvetica-Bold", 8)
-    c.setFillColor(black)
-    c.drawString(margin + 0.2*inch, margin + 0.4*inch, "Private and Confidential Document – Intended for authorized organizations only.")
-    c.setFont("Helvetica", 8)
-    c.drawString(margin + 0.2*inch, margin + 0.25*inch, "info@krify.com")
+    c.doForm("footer")
 
     c.save()
     return path
 
+# ================= PIPELINE =================
+class ConversionError(Exception):
+    """Raised when a resume cannot be turned into a PDF"""
+
+def _cache_key(upload, job_description):
+    """Result cache key: the resume bytes plus every input that changes the PDF, the logo included"""
+    return ResultCache.key(upload, job_description, GROQ_MODEL, GROQ_FAST_MODEL, FAST_MODEL_MAX_TOKENS,
+                           PROMPT_VERSION, PDF_EXTRACTOR, EXTRACT_CHAR_BUDGET, LONG_DOCUMENT_MODE, PROMPT_TOKEN_BUDGET,
+                           CONTACT_CONFIDENCE, LLM_OUTPUT_FORMAT, LLM_SECTIONED, page_chrome.signature)
+
+def _cached(cache_key):
+    cached = result_cache.get(cache_key)
+    metrics.CACHE_LOOKUPS.labels("hit" if cached else "miss").inc()
+    if cached:
+        metrics.CONVERSIONS.labels("cache_hit").inc()
+    return cached
+
+def _resume_text(upload, filename):
+    """Extract and compress the resume text that goes into the prompt"""
+    extraction = {}
+    with metrics.timed("extract"):
+        txt = extract_text(upload, filename, max_chars=None if LONG_DOCUMENT_MODE else EXTRACT_CHAR_BUDGET,
+                           processes=EXTRACT_PROCESSES, min_parallel_pages=PARALLEL_EXTRACT_MIN_PAGES,
+                           backend=PDF_EXTRACTOR, report=extraction)
+    metrics.record_extraction(extraction)
+    metrics.EXTRACTED_CHARS.observe(len(txt))
+    with metrics.timed("compress"):
+        txt = compress_resume(txt, PROMPT_TOKEN_BUDGET)
+    metrics.PROMPT_TEXT_TOKENS.observe(estimate_tokens(txt))
+    return txt
+
+def _render(data, cache_key):
+    """Render the PDF, cache it (unless cache_key is None) and return (download_name, pdf_bytes)"""
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_name = re.sub(r'[^a-zA-Z0-9]', '_', data["Full Name"])[:30] or "Candidate"
+    download_name = f"Resume_{safe_name}_{ts}.pdf"
+    with metrics.timed("render"):
+        pdf = create_resume_pdf(data, io.BytesIO()).getvalue()
+    if cache_key:
+        result_cache.put(cache_key, download_name, pdf)
+    metrics.CONVERSIONS.labels("ok").inc()
+    return download_name, pdf
+
+def convert_document(upload, filename, job_description="", progress=None, latency_budget=None, report=None):
+    """Run extract -> AI -> render for one upload (bytes or binary file) and return (download_name, pdf_bytes)
+
+    latency_budget (seconds) steers model choice; report (a dict) gets the model tier that served it.
+    """
+    return run_steps(_convert_steps(upload, filename, job_description, progress, latency_budget, report))
+
+def _convert_steps(upload, filename, job_description="", progress=None, latency_budget=None, report=None):
+    report = {} if report is None else report
+    progress = progress or (lambda **kw: None)
+    if isinstance(upload, (bytes, bytearray)):
+        upload = io.BytesIO(upload)
+    
+    # Same resume + inputs -> same PDF, served without touching the LLM
+    cache_key = yield _blocking(_cache_key, upload, job_description)
+    cached = yield _blocking(_cached, cache_key)
+    if cached:
+        report.update(tier="cache", reason="cache", hedged=False)
+        return cached
+    
+    progress(stage="extracting", sections=[])
+    txt = yield _blocking(_resume_text, upload, filename)
+    progress(stage="ai", sections=[])
+    with metrics.timed("llm"):
+        data = yield from _ai_data_steps(txt, job_description, progress, latency_budget, report)
+    if not data: raise ConversionError("AI extraction failed")
+    progress(stage="rendering", sections=[key for _, key in SECTION_HEADINGS if data[key]])
+    if not _cacheable(report, bool(job_description)):
+        cache_key = None
+    return (yield _blocking(_render, data, cache_key))
+
+def convert_for_jobs(upload, filename, job_descriptions, latency_budget=None):
+    """Tailor one resume to several job descriptions; returns a generator of ZIP bytes (see _stream_tailored).
+
+    The resume is extracted and structured once, here, so failures raise before
+    any bytes are sent; only the small per-job tailoring calls are left to run
+    concurrently.
+    """
+    data, cache_keys, cached = run_steps(_jobs_steps(upload, filename, job_descriptions, latency_budget))
+    return _stream_tailored(data, job_descriptions, cache_keys, cached, latency_budget)
+
+def _jobs_steps(upload, filename, job_descriptions, latency_budget=None):
+    """(record, cache keys, cached PDFs) for convert_for_jobs; the record is None when every job is cached.
+
+    A job's cache key is None when its PDF must not be cached.
+    """
+    if isinstance(upload, (bytes, bytearray)):
+        upload = io.BytesIO(upload)
+    cache_keys, cached = yield _blocking(_lookup_jobs, upload, job_descriptions)
+    data = None
+    if not all(cached):
+        report = {}
+        txt = yield _blocking(_resume_text, upload, filename)
+        with metrics.timed("llm"):
+            data = yield from _ai_data_steps(txt, latency_budget=latency_budget, report=report)
+        if not data: raise ConversionError("AI extraction failed")
+        if not _cacheable(report):
+            cache_keys = [None] * len(cache_keys)
+    return data, cache_keys, cached
+
+def _lookup_jobs(upload, job_descriptions):
+    cache_keys = [_cache_key(upload, job_description) for job_description in job_descriptions]
+    return cache_keys, [_cached(cache_key) for cache_key in cache_keys]
+
+def _tailored_pdf_steps(data, job_description, cache_key, cached, latency_budget):
+    if cached:
+        return cached
+    report = {}
+    with metrics.timed("tailor"):
+        tailored = yield from _tailor_steps(data, job_description, latency_budget, report)
+    if not _cacheable(report.get("tailor", {})):
+        cache_key = None
+    return (yield _blocking(_render, tailored, cache_key))
+
+def _job_title(job_description):
+    """First line of a job description, for file names and the manifest"""
+    return job_description.strip().splitlines()[0].strip()[:80] if job_description.strip() else ""
+
+def _tailored_entry(download_name, index, title):
+    """ZIP entry name, numbered by position in the request so every job gets its own entry"""
+    label = re.sub(r'[^a-zA-Z0-9]+', '_', title)[:40].strip("_")
+    return f"{download_name[:-4]}_{index + 1:02d}{'_' + label if label else ''}.pdf"
+
+def _add_tailored(zf, manifest, index, job_descriptions, result):
+    """Record one job's outcome, (download_name, pdf) or the exception that stopped it; True if a PDF was written"""
+    title = _job_title(job_descriptions[index])
+    if isinstance(result, Exception):
+        print(f"Multi Error (job {index + 1}): {result}")
+        manifest.append({"job": index + 1, "title": title, "status": "error", "error": str(result) or type(result).__name__})
+        return False
+    download_name, pdf = result
+    entry = _tailored_entry(download_name, index, title)
+    zf.writestr(entry, pdf)
+    manifest.append({"job": index + 1, "title": title, "status": "ok", "output": entry})
+    return True
+
+def _write_tailored_manifest(zf, manifest):
+    zf.writestr("manifest.json", json.dumps(sorted(manifest, key=lambda item: item["job"]), indent=2))
+
+def _stream_tailored(data, job_descriptions, cache_keys, cached, latency_budget):
+    """Tailor and render one PDF per job description concurrently, yielding ZIP bytes as each finishes"""
+    sink = _ZipStream()
+    manifest = []
+    pool = ThreadPoolExecutor(max_workers=len(job_descriptions))
+    try:
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+            futures = {pool.submit(run_steps, _tailored_pdf_steps(data, job_description, cache_key, hit, latency_budget)): index
+                       for index, (job_description, cache_key, hit) in enumerate(zip(job_descriptions, cache_keys, cached))}
+            for future in as_completed(futures):
+                if _add_tailored(zf, manifest, futures[future], job_descriptions, future.exception() or future.result()):
+                    yield sink.drain()
+            
+            _write_tailored_manifest(zf, manifest)
+        yield sink.drain()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _run_job(job):
+    report = lambda **progress: job_store.progress(job["id"], **progress)
+    return convert_document(job["input"], job["filename"], job["job_description"], progress=report)
+
+job_workers = JobWorkerPool(job_store, _run_job, workers=JOB_WORKERS)
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink so ZipFile can emit each entry as soon as it is written"""
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def _batch_inputs():
+    """Collect (filename, read) pairs from uploaded files and ZIP entries, the skipped ones and what to close afterwards.
+
+    Nothing is read here: read() loads one input when its conversion starts, so
+    a batch holds at most BATCH_CONCURRENCY documents in memory.
+    """
+    items, skipped, opened = [], [], []
+    total = 0
+
+    def accept(name, size, read):
+        nonlocal total
+        if size > MAX_UPLOAD_BYTES:
+            skipped.append((name, "file too large"))
+        elif len(items) >= BATCH_MAX_FILES:
+            skipped.append((name, "batch limit reached"))
+        elif total + size > BATCH_MAX_BYTES:
+            skipped.append((name, "batch size limit reached"))
+        else:
+            total += size
+            items.append((name, read))
+
+    for upload in request.files.getlist("candidate_resume") + request.files.getlist("resume_zip"):
+        name = os.path.basename(upload.filename or "")
+        if name.lower().endswith(".zip"):
+            opened.append(_take_stream(upload))
+            try:
+                zf = zipfile.ZipFile(opened[-1])
+            except zipfile.BadZipFile:
+                skipped.append((name, "invalid zip archive"))
+                continue
+            opened.append(zf)
+            for info in zf.infolist():
+                entry = os.path.basename(info.filename)
+                if info.is_dir() or not entry or info.filename.startswith("__MACOSX/"): continue
+                if not entry.lower().endswith(ALLOWED_EXTENSIONS):
+                    skipped.append((entry, "unsupported file type"))
+                else:
+                    accept(entry, info.file_size, lambda zf=zf, info=info: _read_entry(zf, info))
+        elif name.lower().endswith(ALLOWED_EXTENSIONS):
+            opened.append(_take_stream(upload))
+            accept(name, _stream_size(opened[-1]), opened[-1].read)
+        elif name:
+            skipped.append((name, "unsupported file type"))
+    return items, skipped, opened
+
+def _take_stream(upload):
+    """Detach an upload's file from the request, which closes it as soon as the view returns, before the batch streams"""
+    stream, upload.stream = upload.stream, io.BytesIO()
+    return stream
+
+def _read_entry(zf, info):
+    # The size in the archive directory is only a claim; never inflate more than one upload's worth
+    with zf.open(info) as f:
+        data = f.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES: raise ConversionError("file too large")
+    return data
+
+def _stream_size(stream):
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+def _convert_batch_item(read, name, job_description):
+    return convert_document(read(), name, job_description)
+
+def _stream_batch(items, skipped, job_description, opened=()):
+    """Convert items concurrently, yielding ZIP bytes as each candidate finishes"""
+    sink = _ZipStream()
+    manifest = [{"file": name, "status": "skipped", "error": reason} for name, reason in skipped]
+    used_names = set()
+    pool = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY)
+    try:
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+            futures = {pool.submit(_convert_batch_item, read, name, job_description): name for name, read in items}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    download_name, pdf = future.result()
+                except Exception as e:
+                    print(f"Batch Error ({name}): {e}")
+                    manifest.append({"file": name, "status": "error", "error": str(e) or type(e).__name__})
+                    continue
+                
+                stem, n = download_name[:-4], 1
+                while download_name in used_names:
+                    n += 1
+                    download_name = f"{stem}_{n}.pdf"
+                used_names.add(download_name)
+                zf.writestr(download_name, pdf)
+                manifest.append({"file": name, "status": "ok", "output": download_name})
+                yield sink.drain()
+            
+            zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+        yield sink.drain()
+    finally:
+        # Client went away or we finished: drop anything still queued
+        pool.shutdown(wait=False, cancel_futures=True)
+        for f in reversed(opened):
+            f.close()
+
+# ================= WARM-UP =================
+# Rendered and read back once at startup so the first real request finds fonts, logo and code paths loaded
+WARM_UP_RECORD = dict.fromkeys(ALL_FIELDS, "")
+WARM_UP_RECORD.update({"Full Name": "Warm Up", "Professional Title": "Engineer", "Email": "warm-up@example.com",
+                       "Profile Summary": "Primes the **renderer**.", "Technical Skills": "Python, **Flask**"})
+warm_up_seconds = {}
+warm_up_error = None
+_warm_up_lock = threading.Lock()
+_warm_up_started = None
+_ready_pid = None
+_warm_pdf = []
+
+def _warm_stage(name, fn):
+    # Stages already run by a preloading gunicorn master are inherited by its workers
+    if name in warm_up_seconds: return
+    start = time.perf_counter()
+    fn()
+    warm_up_seconds[name] = round(time.perf_counter() - start, 4)
+
+def _warm_imports():
+    import groq, pdfplumber  # noqa: F401 (lazily imported elsewhere; loaded here so no request pays for it)
+    from pdfminer import pdfinterp  # noqa: F401
+
+def _warm_render():
+    _warm_pdf.append(create_resume_pdf(WARM_UP_RECORD, io.BytesIO()).getvalue())
+
+def _warm_extract():
+    extract_text(io.BytesIO(_warm_pdf[-1]), "warm-up.pdf")
+
+def warm_up(per_process=True):
+    """Do the work the first request would otherwise pay for; safe to call again.
+
+    per_process=False stops after the stages that are safe before a fork, which
+    is what a preloading gunicorn master runs (gunicorn.conf.py); workers then
+    only create their own Groq client and extraction process pool.
+    """
+    global warm_up_error, _ready_pid
+    with _warm_up_lock:
+        if _ready_pid == os.getpid(): return
+        try:
+            _warm_stage("imports", _warm_imports)
+            _warm_stage("fonts", preload_fonts)
+            _warm_stage("logo", page_chrome.refresh)
+            _warm_stage("render", _warm_render)
+            _warm_stage("extract", _warm_extract)
+            if not per_process: return
+            _warm_stage("groq_client", groq_pool.client)
+            if LONG_DOCUMENT_MODE and EXTRACT_PROCESSES > 1:
+                _warm_stage("process_pool", lambda: warm_process_pool(EXTRACT_PROCESSES))
+        except Exception as e:
+            # A failed warm-up only costs the first request time; it must not keep the worker out of rotation
+            print(f"Warm-up Error: {e}")
+            warm_up_error = str(e) or type(e).__name__
+        _ready_pid = os.getpid()
+
+def start_warm_up():
+    """Run warm_up on a background thread, once per process"""
+    global _warm_up_started
+    if _warm_up_started == os.getpid(): return
+    _warm_up_started = os.getpid()
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+def is_ready():
+    return _ready_pid == os.getpid()
+
+# ================= ROUTES =================
+@app.before_request
+def start_job_workers():
+    # Once per process; also picks up jobs left behind by a restarted worker
+    job_workers.start()
+    start_warm_up()
+
 @app.route("/")
 def index(): return render_template("hr_converter.html")
 
+@app.route("/readyz")
+def readyz():
+    # Readiness probes also start the warm-up under servers that have no startup hook
+    start_warm_up()
+    ready = is_ready()
+    body = {"ready": ready, "pid": os.getpid(), "warm_up_seconds": warm_up_seconds}
+    if warm_up_error:
+        body["error"] = warm_up_error
+    return jsonify(body), (200 if ready else 503)
+
+@app.route("/stats")
+def stats_route():
+    return jsonify({"cache": result_cache.stats(), "groq_pool": groq_pool.stats()})
+
+@app.route("/metrics")
+def metrics_route():
+    body, content_type = metrics.exposition()
+    return Response(body, content_type=content_type)
+
 @app.route("/convert", methods=["POST"])
 def convert_route():
-    file = request.files.get("candidate_resume")
+    with metrics.timed("upload"):
+        # Multipart parsing (spooling the upload) happens on first access
+        file = request.files.get("candidate_resume")
     if not file: return redirect("/")
     
+    job_description = request.form.get("job_description", "").strip()
+    try:
+        routed = {}
+        download_name, pdf = convert_document(file.stream, file.filename, job_description,
+                                              latency_budget=_latency_budget(), report=routed)
+        resp = send_file(io.BytesIO(pdf), mimetype="application/pdf", as_attachment=True, download_name=download_name)
+        resp.headers.update(_model_headers(routed))
+        # Passthrough responses skip on-close callbacks; the body is in memory so iterating it costs nothing
+        resp.direct_passthrough = False
+        sent = time.perf_counter()
+        resp.call_on_close(lambda: metrics.observe("send", time.perf_counter() - sent))
+        return resp
+    except Exception as e:
+        print(f"Route Error: {e}")
+        return redirect("/")
+
+def _model_headers(routed):
+    """X-Model-Tier (primary, fast or cache) and, when a model served it, X-Model; X-Tailor-Tier and
+    X-Tailor-Model likewise for the tailoring call, which runs even when the extraction was cached"""
+    headers = {"X-Model-Tier": routed.get("tier", "")}
+    if routed.get("model"):
+        headers["X-Model"] = routed["model"]
+    tailor = routed.get("tailor")
+    if tailor:
+        headers["X-Tailor-Tier"] = tailor.get("tier", "")
+        if tailor.get("model"):
+            headers["X-Tailor-Model"] = tailor["model"]
+    return headers
+
+def _latency_budget():
+    """Seconds the caller is willing to wait for the model, from X-Latency-Budget or a latency_budget form field"""
+    return parse_latency_budget(request.headers.get("X-Latency-Budget") or request.form.get("latency_budget"))
+
+def parse_latency_budget(value):
+    try:
+        return float(value) if value and float(value) > 0 else None
+    except ValueError:
+        return None
+
+@app.route("/convert/batch", methods=["POST"])
+def convert_batch_route():
+    items, skipped, opened = _batch_inputs()
+    if not items and not skipped:
+        return jsonify({"error": "upload a ZIP as resume_zip or one or more candidate_resume files"}), 400
+    
+    job_description = request.form.get("job_description", "").strip()
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    in_path = os.path.join(TEMP_DIR, f"in_{ts}_{file.filename}")
-    file.save(in_path)
+    return Response(_stream_batch(items, skipped, job_description, opened), mimetype="application/zip",
+                    headers={"Content-Disposition": f"attachment; filename=Resumes_{ts}.zip"})
+
+@app.route("/convert/multi", methods=["POST"])
+def convert_multi_route():
+    file = request.files.get("candidate_resume")
+    job_descriptions = [jd.strip() for jd in request.form.getlist("job_description") if jd.strip()]
+    error = multi_form_error(file, job_descriptions)
+    if error:
+        return jsonify({"error": error}), 400
     
-    cleanup_list = [in_path]
     try:
-        txt = extract_text(in_path)
-        data = get_ai_data(txt)
-        if not data: return redirect("/")
-        
-        safe_name = re.sub(r'[^a-zA-Z0-9]', '_', data["Full Name"])[:30] or "Candidate"
-        out_path = os.path.join(TEMP_DIR, f"Resume_{safe_name}_{ts}.pdf")
-        final_path = create_resume_pdf(data, out_path)
-        
-        cleanup_list.append(final_path)
-        
-        @after_this_request
-        def cleanup(resp):
-            for f in cleanup_list:
-                if os.path.exists(f): 
-                    try: os.remove(f)
-                    except: pass
-            return resp
-            
-        return send_file(final_path, as_attachment=True, download_name=os.path.basename(final_path))
+        stream = convert_for_jobs(file.read(), file.filename, job_descriptions, latency_budget=_latency_budget())
     except Exception as e:
         print(f"Route Error: {e}")
-        return redirect("/")
+        return jsonify({"error": str(e) or type(e).__name__}), 502
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return Response(stream, mimetype="application/zip",
+                    headers={"Content-Disposition": f"attachment; filename=Tailored_Resumes_{ts}.zip"})
+
+def multi_form_error(file, job_descriptions):
+    """Why a /convert/multi form cannot be served, or None"""
+    if not file or not job_descriptions:
+        return "candidate_resume and one or more job_description fields are required"
+    if len(job_descriptions) > MULTI_MAX_JOBS:
+        return f"at most {MULTI_MAX_JOBS} job descriptions per request"
+    return None
+
+@app.route("/jobs", methods=["POST"])
+def submit_job_route():
+    file = request.files.get("candidate_resume")
+    if not file:
+        return jsonify({"error": "candidate_resume is required"}), 400
+    
+    job_description = request.form.get("job_description", "").strip()
+    job_id = job_store.submit(file.read(), os.path.basename(file.filename or "resume"), job_description)
+    job_workers.notify()
+    status_url = url_for("job_route", job_id=job_id)
+    return jsonify({"id": job_id, "state": "queued", "status_url": status_url}), 202, {"Location": status_url}
+
+@app.route("/jobs/<job_id>")
+def job_route(job_id):
+    job = job_store.get(job_id)
+    if not job:
+        return jsonify({"error": "unknown job"}), 404
+    
+    # Finished jobs serve the PDF directly unless the caller only wants the status
+    if job["state"] == DONE and request.args.get("format") != "json":
+        download_name, pdf = job_store.result(job_id)
+        return send_file(io.BytesIO(pdf), mimetype="application/pdf", as_attachment=True, download_name=download_name)
+    return jsonify(job), (200 if job["state"] in (DONE, FAILED) else 202)
+
+@app.route("/jobs/<job_id>/events")
+def job_events_route(job_id):
+    if not job_store.get(job_id):
+        return jsonify({"error": "unknown job"}), 404
+    
+    def events():
+        # Server-Sent Events: one message per state/progress change until the job settles
+        last, deadline = None, time.time() + JOB_EVENTS_TIMEOUT
+        while time.time() < deadline:
+            job = job_store.get(job_id)
+            current = (job["state"], job["progress"])
+            if current != last:
+                last = current
+                payload = {"state": job["state"], "error": job["error"], **(job["progress"] or {})}
+                yield f"data: {json.dumps(payload)}\n\n"
+            if job["state"] in (DONE, FAILED):
+                return
+            time.sleep(JOB_EVENTS_POLL_SECONDS)
+    
+    return Response(events(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 if __name__ == "__main__":
+    start_warm_up()
     port = int(os.environ.get("PORT", 5003))
     app.run(host="0.0.0.0", port=port)
@@ -0,0 +1,204 @@
+"""ASGI entry point: conversions run on the event loop with AsyncGroq, everything else is the Flask app
+
+    gunicorn asgi:app -k uvicorn_worker.UvicornWorker --workers 2
+    uvicorn asgi:app --host 0.0.0.0 --port 8000
+
+POST /convert and /convert/multi are served here. While a conversion waits on
+Groq it holds no thread, so one worker can keep dozens in flight; extraction,
+the caches and rendering run on a small thread pool (ASYNC_WORKER_THREADS).
+The conversion itself is app.py's pipeline steps (see app.run_steps): only
+how each step is waited for differs.
+Every other route (the page, batch, jobs, /metrics, /stats) is the Flask app
+mounted through a WSGI adapter, so both entry points behave the same.
+"""
+import asyncio
+import contextlib
+import functools
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+import app as core
+import metrics
+from groq_client import AsyncGroqPool
+from preprocess import estimate_tokens
+
+# Threads for extraction, SQLite and rendering; the LLM wait itself needs none
+ASYNC_WORKER_THREADS = int(os.getenv("ASYNC_WORKER_THREADS", 4))
+blocking_pool = ThreadPoolExecutor(max_workers=ASYNC_WORKER_THREADS, thread_name_prefix="asgi-blocking")
+groq_async_pool = AsyncGroqPool(core.GROQ_API_KEY, pool_size=core.GROQ_POOL_SIZE, connect_timeout=core.GROQ_CONNECT_TIMEOUT,
+                                read_timeout=core.GROQ_TIMEOUT, keepalive_seconds=core.GROQ_KEEPALIVE_SECONDS, max_retries=0)
+
+
+async def blocking(fn, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(blocking_pool, functools.partial(fn, *args, **kwargs))
+
+
+async def run_steps(steps):
+    """app.run_steps for the event loop: model calls are awaited, blocking steps go to the thread pool"""
+    value, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error else steps.send(value)
+        except StopIteration as done:
+            return done.value
+        value, error = None, None
+        try:
+            value = await _perform(step)
+        except Exception as e:
+            error = e
+
+
+async def _perform(step):
+    kind, *args = step
+    if kind == "blocking":
+        fn, fn_args = args
+        return await blocking(fn, *fn_args)
+    if kind == "llm":
+        return await _call_llm(*args)
+    if kind == "route":
+        steps_for, tokens, latency_budget, report = args
+        return await core.model_router.run_async(lambda model, lead: run_steps(steps_for(model, lead)),
+                                                 tokens, latency_budget, report)
+    if kind == "gather":
+        return list(await asyncio.gather(*(run_steps(part) for part in args[0])))
+    raise ValueError(f"unknown step {kind!r}")
+
+
+async def _call_llm(model, prompt, completion_tokens, on_delta, kwargs):
+    if on_delta is not None:
+        kwargs = dict(kwargs, stream=True)
+    response = await core.groq_limiter.create_async(
+        groq_async_pool.client(), estimate_tokens(prompt) + completion_tokens, model=model,
+        messages=[{"role": "user", "content": prompt}], **kwargs)
+    if on_delta is None:
+        return response
+    # Leaving the block (including by cancellation, when a hedge wins) closes the HTTP stream
+    async with response:
+        async for chunk in response:
+            delta = core._chunk_text(chunk)
+            if delta:
+                on_delta(delta)
+
+
+async def get_ai_data(resume_text, job_description="", progress=None, latency_budget=None, report=None):
+    """Async app.get_ai_data"""
+    return await run_steps(core._ai_data_steps(resume_text, job_description, progress, latency_budget, report))
+
+
+async def tailor_data(data, job_description, latency_budget=None, report=None):
+    """Async app.tailor_data"""
+    return await run_steps(core._tailor_steps(data, job_description, latency_budget, report))
+
+
+async def convert_document(upload, filename, job_description="", progress=None, latency_budget=None, report=None):
+    """Async app.convert_document"""
+    return await run_steps(core._convert_steps(upload, filename, job_description, progress, latency_budget, report))
+
+
+async def convert_for_jobs(upload, filename, job_descriptions, latency_budget=None):
+    """Async app.convert_for_jobs: extracts once, then returns an async generator of ZIP bytes"""
+    data, cache_keys, cached = await run_steps(core._jobs_steps(upload, filename, job_descriptions, latency_budget))
+    return _stream_tailored(data, job_descriptions, cache_keys, cached, latency_budget)
+
+
+async def _tailored_pdf(index, steps):
+    """(index, (download_name, pdf) or the exception that stopped it)"""
+    try:
+        return index, await run_steps(steps)
+    except Exception as e:
+        return index, e
+
+
+async def _stream_tailored(data, job_descriptions, cache_keys, cached, latency_budget):
+    sink = core._ZipStream()
+    manifest = []
+    tasks = [asyncio.ensure_future(_tailored_pdf(index, core._tailored_pdf_steps(data, job_description, cache_key, hit, latency_budget)))
+             for index, (job_description, cache_key, hit) in enumerate(zip(job_descriptions, cache_keys, cached))]
+    try:
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                if core._add_tailored(zf, manifest, index, job_descriptions, result):
+                    yield sink.drain()
+
+            core._write_tailored_manifest(zf, manifest)
+        yield sink.drain()
+    finally:
+        # Client went away: stop tailoring calls nobody will read
+        for task in tasks:
+            task.cancel()
+
+
+def _sent_metric():
+    # Runs once the response body has gone out, like the Flask route's call_on_close
+    sent = time.perf_counter()
+    return BackgroundTask(lambda: metrics.observe("send", time.perf_counter() - sent))
+
+
+async def convert_route(request):
+    with metrics.timed("upload"):
+        form = await request.form()
+        file = form.get("candidate_resume")
+        if not hasattr(file, "read"):
+            return RedirectResponse("/", status_code=302)
+        upload = await file.read()
+
+    budget = core.parse_latency_budget(request.headers.get("x-latency-budget") or form.get("latency_budget"))
+    try:
+        routed = {}
+        download_name, pdf = await convert_document(upload, file.filename, (form.get("job_description") or "").strip(),
+                                                    latency_budget=budget, report=routed)
+    except Exception as e:
+        print(f"Route Error: {e}")
+        return RedirectResponse("/", status_code=302)
+    headers = {"Content-Disposition": f'attachment; filename="{download_name}"', **core._model_headers(routed)}
+    return Response(pdf, media_type="application/pdf", headers=headers, background=_sent_metric())
+
+
+async def convert_multi_route(request):
+    form = await request.form()
+    file = form.get("candidate_resume")
+    job_descriptions = [jd.strip() for jd in form.getlist("job_description") if isinstance(jd, str) and jd.strip()]
+    error = core.multi_form_error(file if hasattr(file, "read") else None, job_descriptions)
+    if error:
+        return JSONResponse({"error": error}, 400)
+
+    budget = core.parse_latency_budget(request.headers.get("x-latency-budget") or form.get("latency_budget"))
+    try:
+        stream = await convert_for_jobs(await file.read(), file.filename, job_descriptions, latency_budget=budget)
+    except Exception as e:
+        print(f"Route Error: {e}")
+        return JSONResponse({"error": str(e) or type(e).__name__}, 502)
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return StreamingResponse(stream, media_type="application/zip",
+                             headers={"Content-Disposition": f"attachment; filename=Tailored_Resumes_{ts}.zip"})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # The AsyncGroq client is tied to this event loop, so it is built here rather than on the
+    # warm-up thread; startup finishes before any request, /readyz included, is served
+    try:
+        core._warm_stage("groq_async_client", groq_async_pool.client)
+    except Exception as e:
+        print(f"Warm-up Error: {e}")
+        core.warm_up_error = str(e) or type(e).__name__
+    # The rest warms up in the background; /readyz reports 503 until it is done
+    core.start_warm_up()
+    yield
+
+
+app = Starlette(lifespan=lifespan, routes=[
+    Route("/convert", convert_route, methods=["POST"]),
+    Route("/convert/multi", convert_multi_route, methods=["POST"]),
+    Mount("/", WSGIMiddleware(core.app)),
+])
@@ -0,0 +1,81 @@
+"""Speed and text agreement of each PDF extraction backend
+
+    python bench/bench_extractors.py                      # generated single- and two-column resumes
+    python bench/bench_extractors.py resumes/*.pdf        # real documents
+
+For every file, each backend in extraction.PDF_BACKENDS extracts the whole
+document; the table shows ms per page and how closely its words match
+pdfplumber's (1.00 = same words in the same order), plus the backend the
+auto probe would pick. Use it to check that a cheaper backend still gives
+acceptable text before forcing it with PDF_EXTRACTOR.
+"""
+import argparse
+import difflib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from corpus import make_pdf, sentence  # noqa: E402
+from extraction import PDF_BACKENDS, choose_pdf_backend, extract_text, probe_pdf  # noqa: E402
+
+
+def make_two_column_pdf(path, pages):
+    """Sidebar + main column layout, the case position-aware extraction exists for"""
+    import random
+    rng = random.Random(1)
+    c = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for _ in range(pages):
+        y = height - 60
+        while y > 70:
+            c.drawString(40, y, sentence(rng, 4))
+            c.drawString(width / 2, y, sentence(rng, 6))
+            y -= 15
+        c.showPage()
+    c.save()
+    return path
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def agreement(reference, text):
+    return difflib.SequenceMatcher(None, reference.split(), text.split(), autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = args.files or [make_pdf(os.path.join(tmp, "single_column_3p.pdf"), 3),
+                               make_pdf(os.path.join(tmp, "single_column_20p.pdf"), 20),
+                               make_two_column_pdf(os.path.join(tmp, "two_column_3p.pdf"), 3)]
+        print(f"{'file':<28} {'auto':<11} " + " ".join(f"{name + ' ms/p':>16} {'match':>6}" for name in PDF_BACKENDS))
+        for path in files:
+            pages = probe_pdf(path)["pages"] or 1
+            reference = extract_text(path, backend="pdfplumber")
+            cells = []
+            for name in PDF_BACKENDS:
+                text = extract_text(path, backend=name)
+                seconds = best_of(lambda: extract_text(path, backend=name), args.repeat)
+                cells.append(f"{seconds * 1000 / pages:>16.2f} {agreement(reference, text):>6.2f}")
+            print(f"{os.path.basename(path)[:28]:<28} {choose_pdf_backend(probe_pdf(path)):<11} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Serial vs process-pool PDF extraction (pdfplumber backend) by page count
+
+    python bench/bench_parallel_extract.py --processes 4 --pages 4 8 16 32 40
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import make_pdf  # noqa: E402
+from extraction import extract_text, warm_process_pool  # noqa: E402
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 4, 8, 16, 32, 40])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    warm_process_pool(args.processes)
+    print(f"{'pages':>5}  {'serial s':>9}  {'parallel s':>10}  {'speedup':>7}   ({args.processes} processes)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = make_pdf(os.path.join(tmp, f"resume_{pages}.pdf"), pages)
+            serial = best_of(lambda: extract_text(path, backend="pdfplumber"), args.repeat)
+            parallel = best_of(lambda: extract_text(path, processes=args.processes, min_parallel_pages=1,
+                                                    backend="pdfplumber"), args.repeat)
+            print(f"{pages:>5}  {serial:>9.3f}  {parallel:>10.3f}  {serial / parallel:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
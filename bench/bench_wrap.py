@@ -0,0 +1,95 @@
+"""Line wrapping: legacy per-word stringWidth loop vs layout.wrap_runs
+
+    python bench/bench_wrap.py --bullets 400
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.lib.units import inch  # noqa: E402
+from reportlab.pdfbase.pdfmetrics import stringWidth  # noqa: E402
+
+from corpus import WORDS  # noqa: E402
+from layout import preload_fonts, split_bold, wrap_runs  # noqa: E402
+
+MAX_WIDTH = A4[0] - 0.5 * inch * 2 - 0.6 * inch
+
+
+def legacy_wrap(line):
+    """The loop create_resume_pdf used before layout.py: re-measures the whole line per word"""
+    lines, current_line = [], []
+    for word in line.split():
+        if stringWidth(" ".join(current_line + [word]), "Helvetica", 10) < MAX_WIDTH:
+            current_line.append(word)
+        else:
+            lines.append(" ".join(current_line))
+            current_line = [word]
+    if current_line:
+        lines.append(" ".join(current_line))
+    return lines
+
+
+def legacy_bold_wrap(text):
+    """The Desktop variant's draw_text_with_bold: re-sums every part on the line per word"""
+    lines, parts = [], []
+    for font, chunk in split_bold(text):
+        for word in chunk.split():
+            word_width = stringWidth(word + " ", font, 10)
+            line_width = sum(stringWidth(t, f, 10) for f, t in parts)
+            if line_width + word_width > MAX_WIDTH and parts:
+                lines.append(parts)
+                parts = []
+            parts.append((font, word + " "))
+    if parts:
+        lines.append(parts)
+    return lines
+
+
+def experience_section(bullets, words_per_bullet, bold, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(bullets):
+        words = [rng.choice(WORDS) for _ in range(words_per_bullet)]
+        if bold:
+            words = [f"**{w}**" if rng.random() < 0.2 else w for w in words]
+        lines.append(" ".join(words))
+    return lines
+
+
+def timed(fn, lines, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bullets", type=int, default=400)
+    parser.add_argument("--words", type=int, nargs="+", default=[20, 60, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    preload_fonts()
+    new_wrap = lambda line: wrap_runs(split_bold(line), MAX_WIDTH, 10)
+    print(f"{'words/bullet':>12}  {'case':<6}  {'legacy ms':>9}  {'layout ms':>9}  {'speedup':>7}")
+    for words in args.words:
+        plain = experience_section(args.bullets, words, bold=False)
+        assert [["".join(t for _, t in runs) for runs in new_wrap(l)] for l in plain] == [legacy_wrap(l) for l in plain]
+        for case, lines, legacy in (("plain", plain, legacy_wrap),
+                                    ("bold", experience_section(args.bullets, words, bold=True), legacy_bold_wrap)):
+            old = timed(legacy, lines, args.repeat)
+            new = timed(new_wrap, lines, args.repeat)
+            print(f"{words:>12}  {case:<6}  {old * 1000:>9.1f}  {new * 1000:>9.1f}  {old / new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Cold start: import time, gunicorn boot to /readyz, first conversion, with and without preload
+
+    python bench/cold_start.py --workers 2 --repeat 5
+    python bench/cold_start.py --preload 1 --groq-url http://127.0.0.1:8900   # an already running mock
+
+`import app` is timed in fresh interpreters. Then for each GUNICORN_PRELOAD
+setting a fresh gunicorn is started (gunicorn.conf.py is picked up as in
+production) and the script records how long until it answers at all, until
+every worker reports ready on /readyz, how long the first /convert takes, and
+the proportional memory (PSS) of the master plus workers. Results are printed
+and written to bench/results/cold-start-<commit>.json.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from corpus import make_pdf
+from load_test import ROOT, free_port, git_commit, start_mock, stop
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import app; print(time.perf_counter() - start)"
+
+
+def import_seconds(repeat):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, text=True,
+                                      env=dict(os.environ, GROQ_API_KEY="cold-start"))
+        samples.append(float(out.strip().splitlines()[-1]))
+    return samples
+
+
+def pss_mb(pid):
+    """Proportional set size of pid and its children; shared copy-on-write pages count once overall"""
+    total = 0
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+    for p in pids:
+        try:
+            with open(f"/proc/{p}/smaps_rollup") as f:
+                total += sum(int(line.split()[1]) for line in f if line.startswith("Pss:"))
+        except OSError:
+            return None
+    return round(total / 1024, 1)
+
+
+def boot(preload, workers, groq_url, scratch, document, timeout):
+    port = free_port()
+    env = dict(os.environ,
+               GROQ_API_KEY="cold-start", GROQ_BASE_URL=groq_url, GUNICORN_PRELOAD="1" if preload else "0",
+               RESULT_CACHE_PATH=os.path.join(scratch, "results.sqlite3"),
+               JOBS_DB_PATH=os.path.join(scratch, "jobs.sqlite3"),
+               RATE_LIMIT_DB_PATH=os.path.join(scratch, "ratelimit.sqlite3"),
+               PROMETHEUS_MULTIPROC_DIR=os.path.join(scratch, "metrics"))
+    url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "app:app", "-b", f"127.0.0.1:{port}",
+                             "-w", str(workers), "--timeout", "120", "--log-level", "warning"], cwd=ROOT, env=env)
+    result = {"preload": preload, "workers": workers}
+    try:
+        ready = {}
+        deadline = started + timeout
+        with httpx.Client(timeout=5.0) as client:
+            while len(ready) < workers and time.perf_counter() < deadline:
+                try:
+                    response = client.get(url + "/readyz", headers={"Connection": "close"})
+                except httpx.HTTPError:
+                    time.sleep(0.02)
+                    continue
+                result.setdefault("first_response_s", round(time.perf_counter() - started, 3))
+                body = response.json()
+                if response.status_code == 200:
+                    ready.setdefault(body["pid"], body["warm_up_seconds"])
+                else:
+                    time.sleep(0.02)
+            if len(ready) < workers:
+                raise SystemExit(f"gunicorn (preload={preload}) did not get ready in {timeout}s")
+            result["ready_s"] = round(time.perf_counter() - started, 3)
+            result["warm_up_seconds"] = next(iter(ready.values()))
+            result["pss_mb"] = pss_mb(proc.pid)
+
+            name, data = document
+            start = time.perf_counter()
+            status = client.post(url + "/convert", files={"candidate_resume": (name, data, "application/pdf")},
+                                 timeout=120).status_code
+            result["first_convert_s"] = round(time.perf_counter() - start, 3)
+            result["first_convert_status"] = status
+    finally:
+        stop(proc)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start of the app under gunicorn")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5, help="boots (and fresh `import app` runs) per setting")
+    parser.add_argument("--preload", type=int, nargs="+", default=[1, 0], choices=[0, 1])
+    parser.add_argument("--groq-url", help="use an already running mock (or other) Groq endpoint")
+    parser.add_argument("--timeout", type=float, default=60)
+    mock = parser.add_argument_group("mock Groq (see bench/mock_groq.py)")
+    mock.add_argument("--latency", default="fixed")
+    mock.add_argument("--latency-ms", type=float, default=300)
+    mock.add_argument("--latency-sd-ms", type=float, default=0)
+    mock.add_argument("--tokens-per-s", type=float, default=400)
+    parser.add_argument("--output", help="JSON results path (default bench/results/cold-start-<commit>.json)")
+    args = parser.parse_args()
+    args.error_rate = args.rate_limit_rate = args.rpm = args.tpm = 0
+
+    samples = import_seconds(args.repeat)
+    print(f"import app       median {statistics.median(samples) * 1000:.0f} ms  "
+          f"(min {min(samples) * 1000:.0f}, max {max(samples) * 1000:.0f}, n={len(samples)})", flush=True)
+
+    scratch = tempfile.mkdtemp(prefix="resume_cold_")
+    mock_proc = None
+    runs = []
+    try:
+        groq_url = args.groq_url
+        if not groq_url:
+            mock_proc, groq_url = start_mock(args)
+        for preload in args.preload:
+            boots = []
+            for i in range(args.repeat):
+                # A different resume each boot, so the first conversion is never a cache hit
+                path = make_pdf(os.path.join(scratch, f"resume_{preload}_{i}.pdf"), 2, seed=1000 * preload + i)
+                with open(path, "rb") as f:
+                    document = (os.path.basename(path), f.read())
+                boots.append(boot(bool(preload), args.workers, groq_url, tempfile.mkdtemp(dir=scratch), document, args.timeout))
+            median = lambda key: round(statistics.median(b[key] for b in boots if b.get(key) is not None), 3)
+            run = {"preload": bool(preload), "workers": args.workers, "boots": boots,
+                   **{f"median_{key}": median(key) for key in ("first_response_s", "ready_s", "first_convert_s", "pss_mb")}}
+            runs.append(run)
+            print(f"preload={preload}  up {run['median_first_response_s']:.2f} s  ready {run['median_ready_s']:.2f} s  "
+                  f"first convert {run['median_first_convert_s']:.2f} s  PSS {run['median_pss_mb']} MB", flush=True)
+    finally:
+        if mock_proc:
+            stop(mock_proc)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": f"{os.uname().sysname} {os.uname().machine} ({os.cpu_count()} CPUs)",
+        "import_app_s": [round(s, 4) for s in samples],
+        "runs": runs,
+    }
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", f"cold-start-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {output}")
+
+
+if __name__ == "__main__":
+    main()
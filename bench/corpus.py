@@ -0,0 +1,99 @@
+"""Synthetic resume documents for offline benchmarks"""
+import json
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+WORDS = ("developed designed implemented led migrated optimised services pipelines java spring boot "
+         "python flask react kubernetes docker aws latency throughput customers team reduced improved "
+         "microservices postgres kafka dashboards testing automation delivery stakeholders").split()
+
+
+def sentence(rng, words=14):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_pdf(path, pages, seed=0):
+    """Write a text-only resume-like PDF with the given number of pages"""
+    rng = random.Random(seed)
+    c = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for page in range(pages):
+        y = height - 60
+        if page == 0:
+            c.setFont("Helvetica-Bold", 16)
+            c.drawString(50, y, "Jane Candidate")
+            c.setFont("Helvetica", 10)
+            c.drawString(50, y - 18, "jane.candidate@example.com | +1 555 010 2030 | Austin, TX")
+            y -= 50
+        c.setFont("Helvetica", 10)
+        while y > 70:
+            c.drawString(50, y, "- " + sentence(rng))
+            y -= 15
+        c.drawString(width / 2, 40, f"Page {page + 1}")
+        c.showPage()
+    c.save()
+    return path
+
+
+def make_docx(path, pages, seed=0):
+    """Write a minimal DOCX with roughly the text of `pages` PDF pages"""
+    rng = random.Random(seed)
+    paragraphs = ["Jane Candidate", "jane.candidate@example.com | +1 555 010 2030 | Austin, TX"]
+    paragraphs += ["- " + sentence(rng) for _ in range(pages * 48)]
+    body = "".join(f'<w:p><w:r><w:t xml:space="preserve">{escape(p)}</w:t></w:r></w:p>' for p in paragraphs)
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body}</w:body></w:document>')
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"/>')
+        docx.writestr("word/document.xml", document)
+    return path
+
+
+def canned_response(jobs=3, bullets=10, projects=2, seed=0):
+    """A model reply in the exact format get_ai_data asks Groq for"""
+    rng = random.Random(seed)
+    bold = lambda: f"**{rng.choice(WORDS)}**"
+    lines = [
+        "CANDIDATE INFORMATION:",
+        "- Full Name: Jane Candidate",
+        "- Professional Title: Java Developer",
+        "- Email: jane.candidate@example.com",
+        "- Phone: +1 555 010 2030",
+        "- Location: Austin, TX",
+        "",
+        "PROFILE SUMMARY:",
+        f"{sentence(rng, 30)} Skilled in {bold()} and {bold()}.",
+        "",
+        "PROFESSIONAL EXPERIENCE:",
+    ]
+    for job in range(jobs):
+        lines.append(f"Company {job + 1} | Senior Engineer | Jan 20{10 + job} - Dec 20{12 + job}")
+        lines += [f"- {sentence(rng, 18)} Using {bold()}." for _ in range(bullets)]
+    lines += ["", "PROJECT EXPERIENCE:"]
+    for project in range(projects):
+        lines += [f"Project Name: Project {project + 1}", f"Technologies: {bold()}, {bold()}",
+                  "Responsibilities:"] + [f"- {sentence(rng)}" for _ in range(5)]
+    lines += ["", "TECHNICAL SKILLS:", ", ".join(sorted(set(WORDS[:20]))),
+              "", "SOFT SKILLS:", "Communication, Leadership, Problem-solving"]
+    return "\n".join(lines)
+
+
+def canned_json_response(jobs=3, bullets=10, projects=2, seed=0):
+    """The same reply as canned_response in the LLM_OUTPUT_FORMAT=json shape"""
+    reply, section = {}, None
+    for line in canned_response(jobs, bullets, projects, seed).splitlines():
+        if not line:
+            continue
+        if line.endswith(":") and line.isupper():
+            section = None if line == "CANDIDATE INFORMATION:" else line[:-1].title()
+        elif section is None:
+            field, value = line[2:].split(":", 1)
+            reply[field] = value.strip()
+        else:
+            reply.setdefault(section, []).append(line)
+    return json.dumps(reply)
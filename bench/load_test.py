@@ -0,0 +1,226 @@
+"""Load test /convert against a local mock Groq, across gunicorn worker settings
+
+    python bench/load_test.py --worker-classes sync gthread --workers 1 2 4 --concurrency 8 --requests 80
+    python bench/load_test.py --target http://127.0.0.1:5000 --concurrency 16   # an app you started yourself
+
+For every worker class / worker count pair a fresh gunicorn is started with
+GROQ_BASE_URL pointing at bench/mock_groq.py, warmed up, and driven with
+--concurrency parallel uploads. Each upload is a different generated resume
+so the result cache never answers. Throughput, latency percentiles and error
+rates are printed and written to bench/results/load-<commit>.json.
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from corpus import make_pdf
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MOCK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_groq.py")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return True
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    return False
+
+
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(round(q * (len(samples) - 1))))] if samples else None
+
+
+def start_mock(args):
+    port = free_port()
+    cmd = [sys.executable, MOCK, "--port", str(port), "--latency", args.latency,
+           "--latency-ms", str(args.latency_ms), "--latency-sd-ms", str(args.latency_sd_ms),
+           "--tokens-per-s", str(args.tokens_per_s), "--error-rate", str(args.error_rate),
+           "--rate-limit-rate", str(args.rate_limit_rate), "--rpm", str(args.rpm), "--tpm", str(args.tpm)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    if not wait_until_up(url + "/stats"):
+        proc.kill()
+        raise SystemExit("mock Groq server did not start")
+    return proc, url
+
+
+def start_app(worker_class, workers, threads, groq_url, scratch):
+    port = free_port()
+    env = dict(os.environ,
+               GROQ_API_KEY="load-test", GROQ_BASE_URL=groq_url,
+               RESULT_CACHE_PATH=os.path.join(scratch, "results.sqlite3"),
+               JOBS_DB_PATH=os.path.join(scratch, "jobs.sqlite3"),
+               RATE_LIMIT_DB_PATH=os.path.join(scratch, "ratelimit.sqlite3"),
+               PROMETHEUS_MULTIPROC_DIR=os.path.join(scratch, "metrics"))
+    cmd = [sys.executable, "-m", "gunicorn", "app:app", "-b", f"127.0.0.1:{port}",
+           "-k", worker_class, "-w", str(workers), "--timeout", "120", "--log-level", "warning"]
+    # gunicorn.conf.py sets threads, and gunicorn quietly runs "sync" as gthread when threads > 1
+    cmd += ["--threads", str(threads if worker_class == "gthread" else 1)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    url = f"http://127.0.0.1:{port}"
+    if not wait_until_up(url + "/stats"):
+        proc.kill()
+        raise SystemExit(f"gunicorn ({worker_class} x{workers}) did not start")
+    return proc, url
+
+
+def stop(proc):
+    proc.terminate()
+    try:
+        proc.wait(10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def drive(url, documents, concurrency, timeout):
+    """POST every document to /convert, `concurrency` at a time; returns per-request (status, seconds)"""
+    with httpx.Client(timeout=timeout, limits=httpx.Limits(max_connections=concurrency)) as client:
+        def one(doc):
+            name, data = doc
+            start = time.perf_counter()
+            try:
+                status = client.post(url + "/convert", files={"candidate_resume": (name, data, "application/pdf")},
+                                     follow_redirects=False).status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            return status, time.perf_counter() - start
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            outcomes = list(pool.map(one, documents))
+        return outcomes, time.perf_counter() - started
+
+
+def summarise(outcomes, elapsed):
+    ok = sorted(seconds for status, seconds in outcomes if status == 200)
+    errors = {}
+    for status, _ in outcomes:
+        if status != 200:
+            errors[str(status)] = errors.get(str(status), 0) + 1
+    ms = lambda s: round(s * 1000, 1) if s is not None else None
+    return {
+        "requests": len(outcomes),
+        "ok": len(ok),
+        "error_rate": round(1 - len(ok) / len(outcomes), 4) if outcomes else 0,
+        "errors": errors,
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else None,
+        "p50_ms": ms(percentile(ok, 0.50)),
+        "p90_ms": ms(percentile(ok, 0.90)),
+        "p99_ms": ms(percentile(ok, 0.99)),
+        "mean_ms": ms(statistics.fmean(ok)) if ok else None,
+        "elapsed_s": round(elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /convert against a mock Groq server")
+    parser.add_argument("--target", help="existing app URL; skips starting gunicorn and the mock")
+    parser.add_argument("--groq-url", help="use an already running mock (or other) Groq endpoint")
+    parser.add_argument("--worker-classes", nargs="+", default=["sync", "gthread"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4, help="threads per gthread worker")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=120)
+    mock = parser.add_argument_group("mock Groq (see bench/mock_groq.py)")
+    mock.add_argument("--latency", default="lognormal")
+    mock.add_argument("--latency-ms", type=float, default=500)
+    mock.add_argument("--latency-sd-ms", type=float, default=200)
+    mock.add_argument("--tokens-per-s", type=float, default=300)
+    mock.add_argument("--error-rate", type=float, default=0.0)
+    mock.add_argument("--rate-limit-rate", type=float, default=0.0)
+    mock.add_argument("--rpm", type=int, default=0)
+    mock.add_argument("--tpm", type=int, default=0)
+    parser.add_argument("--output", help="JSON results path (default bench/results/load-<commit>.json)")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="resume_load_")
+    documents = []
+    for i in range(args.requests + args.warmup):
+        path = make_pdf(os.path.join(scratch, f"resume_{i}.pdf"), args.pages, seed=i)
+        with open(path, "rb") as f:
+            documents.append((f"resume_{i}.pdf", f.read()))
+    warmup, documents = documents[:args.warmup], documents[args.warmup:]
+
+    runs = []
+    mock_proc = None
+    try:
+        if args.target:
+            configs = [("external", None)]
+        else:
+            configs = [(cls, n) for cls in args.worker_classes for n in args.workers]
+            if args.groq_url:
+                groq_url = args.groq_url
+            else:
+                mock_proc, groq_url = start_mock(args)
+        for worker_class, workers in configs:
+            app_proc = None
+            if args.target:
+                url = args.target.rstrip("/")
+            else:
+                run_dir = tempfile.mkdtemp(dir=scratch)
+                app_proc, url = start_app(worker_class, workers, args.threads, groq_url, run_dir)
+            try:
+                drive(url, warmup, min(args.concurrency, len(warmup)) or 1, args.timeout)
+                outcomes, elapsed = drive(url, documents, args.concurrency, args.timeout)
+            finally:
+                if app_proc:
+                    stop(app_proc)
+            result = {"worker_class": worker_class, "workers": workers,
+                      "threads": args.threads if worker_class == "gthread" else 1,
+                      "concurrency": args.concurrency, **summarise(outcomes, elapsed)}
+            runs.append(result)
+            print(f"{worker_class:<9} x{workers or '-':<3} {result['throughput_rps']:>8} req/s  "
+                  f"p50 {result['p50_ms']} ms  p90 {result['p90_ms']} ms  p99 {result['p99_ms']} ms  "
+                  f"errors {result['error_rate']:.1%} {result['errors'] or ''}", flush=True)
+    finally:
+        if mock_proc:
+            stop(mock_proc)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": f"{os.uname().sysname} {os.uname().machine} ({os.cpu_count()} CPUs)",
+        "mock": {k: getattr(args, k) for k in ("latency", "latency_ms", "latency_sd_ms", "tokens_per_s",
+                                               "error_rate", "rate_limit_rate", "rpm", "tpm")},
+        "runs": runs,
+    }
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", f"load-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Local stand-in for the Groq chat completions API, for load tests
+
+    python bench/mock_groq.py --port 8900 --latency lognormal --latency-ms 800 --tokens-per-s 250
+    GROQ_BASE_URL=http://127.0.0.1:8900 gunicorn app:app
+
+Serves POST /openai/v1/chat/completions (streaming and non-streaming) with a
+canned reply in the format get_ai_data expects (JSON when response_format asks
+for a json_object), cut down to the fields the prompt asks for. Time to first token follows a
+configurable distribution, tokens are then paced at --tokens-per-s, and a
+share of requests can fail with 500 or 429. Requests and tokens are also
+metered per minute like the real API (buckets refilling continuously): the
+usual x-ratelimit-* headers are sent and an empty bucket answers 429 with
+retry-after.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from corpus import canned_json_response, canned_response
+
+SIZES = {"small": dict(jobs=1, bullets=5, projects=1),
+         "medium": dict(jobs=3, bullets=10, projects=2),
+         "large": dict(jobs=8, bullets=15, projects=6)}
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class RateBuckets:
+    """Per-minute request and token budgets refilled continuously, as Groq meters them"""
+
+    def __init__(self, rpm, tpm):
+        self.limits = {"requests": rpm, "tokens": tpm}
+        self.levels = {"requests": float(rpm), "tokens": float(tpm)}
+        self._lock = threading.Lock()
+        self._updated = time.monotonic()
+
+    def take(self, tokens):
+        """Charge one request; returns (allowed, headers)"""
+        costs = {"requests": 1, "tokens": tokens}
+        with self._lock:
+            now = time.monotonic()
+            for kind, limit in self.limits.items():
+                if limit:
+                    self.levels[kind] = min(limit, self.levels[kind] + limit / 60 * (now - self._updated))
+            self._updated = now
+            short = {kind: costs[kind] - self.levels[kind] for kind, limit in self.limits.items()
+                     if limit and self.levels[kind] < min(costs[kind], limit)}
+            if not short:
+                for kind, limit in self.limits.items():
+                    if limit:
+                        self.levels[kind] -= min(costs[kind], limit)
+            headers = {}
+            for kind, limit in self.limits.items():
+                limit = limit or (1000000 if kind == "requests" else 100000000)
+                level = self.levels[kind] if self.limits[kind] else limit
+                headers[f"x-ratelimit-limit-{kind}"] = limit
+                headers[f"x-ratelimit-remaining-{kind}"] = int(max(level, 0))
+                headers[f"x-ratelimit-reset-{kind}"] = f"{max(limit - level, 0) / limit * 60:.2f}s"
+            if short:
+                headers["retry-after"] = f"{max(need / (self.limits[kind] / 60) for kind, need in short.items()):.2f}"
+            return not short, headers
+
+
+class MockGroq:
+    def __init__(self, args):
+        self.args = args
+        self.replies = {"text": canned_response(**SIZES[args.reply]), "json_object": canned_json_response(**SIZES[args.reply])}
+        self.window = RateBuckets(args.rpm, args.tpm)
+        self.rng = random.Random(args.seed)
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0}
+
+    def first_token_delay(self):
+        a = self.args
+        mean, sd = a.latency_ms / 1000, a.latency_sd_ms / 1000
+        with self._lock:
+            if a.latency == "fixed":
+                delay = mean
+            elif a.latency == "uniform":
+                delay = self.rng.uniform(mean - sd, mean + sd)
+            elif a.latency == "normal":
+                delay = self.rng.gauss(mean, sd)
+            elif a.latency == "exponential":
+                delay = self.rng.expovariate(1 / mean) if mean else 0
+            else:
+                # lognormal with the requested mean and standard deviation
+                if not mean:
+                    delay = 0
+                else:
+                    sigma2 = math.log(1 + (sd / mean) ** 2)
+                    delay = self.rng.lognormvariate(math.log(mean) - sigma2 / 2, sigma2 ** 0.5)
+        return max(delay, 0.0)
+
+    def reply_for(self, body):
+        """The canned reply limited to the fields and sections the prompt asks for (e.g. one LLM_SECTIONED sub-prompt)"""
+        prompt = "".join(m.get("content") or "" for m in body.get("messages", []))
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            reply = json.loads(self.replies["json_object"])
+            return json.dumps({k: v for k, v in reply.items() if f'"{k}"' in prompt} or reply)
+        asked = prompt.split("FORMAT:", 1)[-1].split("TEXT:", 1)[0]
+        kept = []
+        for block in self.replies["text"].split("\n\n"):
+            heading, *lines = block.split("\n")
+            if heading not in asked:
+                continue
+            if heading == "CANDIDATE INFORMATION:":
+                lines = [line for line in lines if line[2:].split(":", 1)[0] + ":" in asked]
+            kept.append("\n".join([heading] + lines))
+        return "\n\n".join(kept) or self.replies["text"]
+
+    def roll(self):
+        with self._lock:
+            return self.rng.random()
+
+    def count(self, key):
+        with self._lock:
+            self.counts["requests"] += 1
+            self.counts[key] += 1
+
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            if mock.args.verbose:
+                super().log_message(fmt, *args)
+
+        def _json(self, status, body, headers=None):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, str(value))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _chunk(self, data):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                self._json(200, mock.counts)
+            else:
+                self._json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._json(404, {"error": {"message": "not found"}})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            # response_format {"type": "json_object"} gets the same content as a JSON object
+            reply = mock.reply_for(body)
+            completion_tokens = estimate_tokens(reply)
+            prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in body.get("messages", []))
+            allowed, headers = mock.window.take(prompt_tokens + completion_tokens)
+            roll = mock.roll()
+            if not allowed or roll < mock.args.rate_limit_rate:
+                headers.setdefault("retry-after", "1")
+                mock.count("rate_limited")
+                self._json(429, {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}}, headers)
+                return
+            if roll < mock.args.rate_limit_rate + mock.args.error_rate:
+                mock.count("errors")
+                self._json(500, {"error": {"message": "mock upstream error", "type": "internal_server_error"}}, headers)
+                return
+
+            time.sleep(mock.first_token_delay())
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+            created = int(time.time())
+            model = body.get("model", "mock")
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                     "total_tokens": prompt_tokens + completion_tokens}
+            if not body.get("stream"):
+                time.sleep(completion_tokens / mock.args.tokens_per_s if mock.args.tokens_per_s else 0)
+                mock.count("ok")
+                self._json(200, {
+                    "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": reply}}],
+                    "usage": usage,
+                }, headers)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            for name, value in headers.items():
+                self.send_header(name, str(value))
+            self.end_headers()
+            step = mock.args.chunk_tokens * CHARS_PER_TOKEN
+            pause = mock.args.chunk_tokens / mock.args.tokens_per_s if mock.args.tokens_per_s else 0
+            try:
+                for i in range(0, len(reply), step):
+                    chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                             "choices": [{"index": 0, "delta": {"content": reply[i:i + step]}, "finish_reason": None}]}
+                    self._chunk(b"data: " + json.dumps(chunk).encode("utf-8") + b"\n\n")
+                    self.wfile.flush()
+                    time.sleep(pause)
+                final = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                         "x_groq": {"id": completion_id, "usage": usage}}
+                self._chunk(b"data: " + json.dumps(final).encode("utf-8") + b"\n\n")
+                self._chunk(b"data: [DONE]\n\n")
+                self._chunk(b"")
+                self.wfile.flush()
+                mock.count("ok")
+            except (BrokenPipeError, ConnectionResetError):
+                mock.count("errors")
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock Groq chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "normal", "exponential", "lognormal"],
+                        help="distribution of the time to first token")
+    parser.add_argument("--latency-ms", type=float, default=500, help="mean time to first token")
+    parser.add_argument("--latency-sd-ms", type=float, default=200, help="spread of the time to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=300, help="completion token rate (0 = instant)")
+    parser.add_argument("--chunk-tokens", type=int, default=4, help="tokens per streamed chunk")
+    parser.add_argument("--reply", default="medium", choices=sorted(SIZES))
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute before 429 (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="tokens per minute before 429 (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(MockGroq(args)))
+    server.daemon_threads = True
+    print(f"mock Groq listening on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""Per-stage benchmarks for the conversion pipeline, fully offline
+
+    python bench/run_benchmarks.py                        # writes bench/results/<commit>.json
+    python bench/run_benchmarks.py --compare bench/results/abc1234.json
+
+Extraction runs over generated PDF/DOCX files from 1 to 40 pages; parsing,
+rendering and the full pipeline replay canned model replies through a stub
+Groq client, so no network or API key is needed.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+# Keep the app's SQLite stores out of the real temp dir and never look for a real key
+_scratch = tempfile.mkdtemp(prefix="resume_bench_")
+os.environ.setdefault("RESULT_CACHE_PATH", os.path.join(_scratch, "results.sqlite3"))
+os.environ.setdefault("JOBS_DB_PATH", os.path.join(_scratch, "jobs.sqlite3"))
+os.environ["GROQ_API_KEY"] = "offline-benchmark"
+
+import app  # noqa: E402
+from corpus import canned_json_response, canned_response, make_docx, make_pdf  # noqa: E402
+
+PAGES = [1, 5, 10, 20, 40]
+REPLIES = {"small": dict(jobs=1, bullets=5, projects=1),
+           "medium": dict(jobs=3, bullets=10, projects=2),
+           "large": dict(jobs=8, bullets=15, projects=6)}
+
+
+class StubGroq:
+    """Stands in for groq.Groq: replays a canned reply as a stream of small deltas"""
+
+    def __init__(self, reply, chunk=8, json_reply=None):
+        self.reply = reply
+        self.json_reply = json_reply
+        self.chunk = chunk
+        self.chat = SimpleNamespace(completions=self)
+        # What RateLimiter calls: the same reply wrapped like a raw response with (empty) headers
+        self.with_raw_response = SimpleNamespace(
+            create=lambda **kwargs: SimpleNamespace(headers={}, parse=lambda: self.create(**kwargs)))
+
+    def create(self, stream=False, response_format=None, **kwargs):
+        if not stream:
+            content = self.json_reply if response_format else self.reply
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        return (SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=self.reply[i:i + self.chunk]))])
+                for i in range(0, len(self.reply), self.chunk))
+
+
+def measure(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        "runs": repeat,
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))], 3),
+        "mean_ms": round(mean, 3),
+        "ops_per_s": round(1000 / mean, 2) if mean else None,
+    }
+
+
+def bench_extract(results, tmp, pages_list, repeat):
+    for kind, make in (("pdf", make_pdf), ("docx", make_docx)):
+        for pages in pages_list:
+            path = make(os.path.join(tmp, f"resume_{pages}.{kind}"), pages)
+            with open(path, "rb") as f:
+                data = f.read()
+            for mode, budget in (("budget", app.EXTRACT_CHAR_BUDGET), ("full", None)):
+                # Fewer runs for the slow whole-document PDF cases
+                runs = max(3, repeat // 4) if kind == "pdf" and budget is None and pages >= 20 else repeat
+                stats = measure(lambda: app.extract_text(io.BytesIO(data), path, max_chars=budget), runs)
+                stats["pages_per_s"] = round(pages * stats["ops_per_s"], 2)
+                results[f"extract.{kind}.{mode}[{pages}p]"] = stats
+            if kind == "pdf":
+                text = app.extract_text(io.BytesIO(data), path)
+                results[f"compress[{pages}p]"] = measure(lambda: app.compress_resume(text, app.PROMPT_TOKEN_BUDGET), repeat)
+
+
+def bench_parse_render(results, repeat):
+    for size, shape in REPLIES.items():
+        reply = canned_response(**shape)
+        data = app.parse_ai_response(reply)
+        results[f"parse[{size}]"] = measure(lambda: app.parse_ai_response(reply), repeat)
+
+        def streamed():
+            parser = app.ResponseParser()
+            for i in range(0, len(reply), 8):
+                parser.feed(reply[i:i + 8])
+            return parser.close()
+        results[f"parse.stream[{size}]"] = measure(streamed, repeat)
+        json_reply = canned_json_response(**shape)
+        results[f"parse.json[{size}]"] = measure(lambda: app.parse_json_response(json_reply, app.ALL_FIELDS), repeat)
+        results[f"render[{size}]"] = measure(lambda: app.create_resume_pdf(data, io.BytesIO()), repeat)
+
+
+def bench_pipeline(results, tmp, repeat):
+    """extract -> stubbed LLM -> parse -> render, with the PDF and extraction caches bypassed"""
+    path = make_pdf(os.path.join(tmp, "pipeline.pdf"), 2)
+    with open(path, "rb") as f:
+        data = f.read()
+    app.result_cache.get = app.result_cache.get_data = lambda key: None
+    app.result_cache.put = app.result_cache.put_data = lambda *args: None
+    for size, shape in REPLIES.items():
+        app.groq_pool.client = lambda stub=StubGroq(canned_response(**shape), json_reply=canned_json_response(**shape)): stub
+        results[f"pipeline[{size}]"] = measure(lambda: app.convert_document(data, "pipeline.pdf"), repeat)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline['commit']} (p50 ms, lower is better)")
+    print(f"{'case':<32} {'before':>10} {'after':>10} {'change':>8}")
+    for case, stats in current["results"].items():
+        old = baseline["results"].get(case)
+        if old:
+            change = (stats["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0
+            print(f"{case:<32} {old['p50_ms']:>10.2f} {stats['p50_ms']:>10.2f} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline per-stage benchmarks")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=PAGES)
+    parser.add_argument("--stages", nargs="+", default=["extract", "parse", "pipeline"],
+                        choices=["extract", "parse", "pipeline"])
+    parser.add_argument("--output", help="JSON results path (default bench/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE_JSON")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if "extract" in args.stages:
+            bench_extract(results, tmp, args.pages, args.repeat)
+        if "parse" in args.stages:
+            bench_parse_render(results, args.repeat)
+        if "pipeline" in args.stages:
+            bench_pipeline(results, tmp, args.repeat)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "results": results,
+    }
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'case':<32} {'p50 ms':>10} {'p95 ms':>10} {'ops/s':>10}")
+    for case, stats in results.items():
+        print(f"{case:<32} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} {stats['ops_per_s']:>10.1f}")
+    print(f"\nwrote {output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
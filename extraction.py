@@ -0,0 +1,251 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+import pypdfium2 as pdfium
+
+# pdfplumber and pdfminer are imported where used: most PDFs only ever need PDFium, and workers start faster
+
+DOCX_NAMESPACE = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+W_BODY = '{%s}body' % DOCX_NAMESPACE['w']
+W_PARAGRAPH = '{%s}p' % DOCX_NAMESPACE['w']
+W_TEXT = '{%s}t' % DOCX_NAMESPACE['w']
+# PDFium is not thread-safe: every call into it, for any document, holds this lock
+_pdfium_lock = threading.Lock()
+# Ends every PDF page's text so later stages can tell pages apart (form feed, as pdftotext does)
+PAGE_BREAK = "\n\f"
+
+
+def _rewind(source):
+    """Paths pass through; file objects are rewound so every reader starts at byte 0"""
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+
+def iter_pdf_pages(source, pages=None):
+    """Yield the text of each PDF page, parsing a page only when the caller asks for it"""
+    import pdfplumber
+    numbers = [i + 1 for i in pages] if pages is not None else None
+    with pdfplumber.open(_rewind(source), pages=numbers) as pdf:
+        for page in pdf.pages:
+            yield (page.extract_text() or "") + PAGE_BREAK
+            # Release the parsed layout objects before moving on
+            page.close()
+
+
+def iter_pdfium_pages(source, pages=None):
+    """PDFium's native text layer in content order; fastest, fine for single-column documents"""
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(_rewind(source))
+        count = len(pdf)
+    try:
+        for i in (pages if pages is not None else range(count)):
+            # Released between pages so concurrent conversions interleave instead of queueing per document
+            with _pdfium_lock:
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range().replace("\r\n", "\n")
+                textpage.close()
+                page.close()
+            yield text + PAGE_BREAK
+    finally:
+        with _pdfium_lock:
+            pdf.close()
+
+
+def iter_pdfminer_pages(source, pages=None):
+    """pdfminer with layout analysis off; a new line starts wherever the baseline moves"""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield from iter_pdfminer_pages(f, pages)
+        return
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.layout import LTChar, LTContainer
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    resources = PDFResourceManager()
+    device = PDFPageAggregator(resources, laparams=None)
+    interpreter = PDFPageInterpreter(resources, device)
+    for page in PDFPage.get_pages(_rewind(source), pagenos=set(pages) if pages is not None else None):
+        interpreter.process_page(page)
+        parts, baseline = [], None
+        stack = [iter(device.get_result())]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+            elif isinstance(item, LTChar):
+                if baseline is not None and abs(item.y0 - baseline) > item.height / 2:
+                    parts.append("\n")
+                baseline = item.y0
+                parts.append(item.get_text())
+            elif isinstance(item, LTContainer):
+                stack.append(iter(item))
+        yield "".join(parts) + PAGE_BREAK
+
+
+# Page iterators by name: iter(source, pages=None) -> text of each page, pages being 0-based indices
+PDF_BACKENDS = {
+    "pdfplumber": iter_pdf_pages,
+    "pypdfium2": iter_pdfium_pages,
+    "pdfminer": iter_pdfminer_pages,
+}
+# Share of first-page text runs that jump back up the page above which the content order is not trusted
+DISORDER_THRESHOLD = 0.1
+
+
+def probe_pdf(source):
+    """Quick look at page 1 with PDFium (a few ms): page count, text layer and whether text is stored in reading order"""
+    with _pdfium_lock:
+        return _probe_pdf(source)
+
+
+def _probe_pdf(source):
+    pdf = pdfium.PdfDocument(_rewind(source))
+    try:
+        info = {"pages": len(pdf), "chars": 0, "disorder": 0.0}
+        if not info["pages"]:
+            return info
+        page = pdf[0]
+        textpage = page.get_textpage()
+        info["chars"] = textpage.count_chars()
+        rects = [textpage.get_rect(i) for i in range(textpage.count_rects())]
+        # (left, bottom, right, top): a run starting more than a line above the previous one breaks top-down order.
+        # A second column stored after the first costs one jump; text emitted in drawing order costs many.
+        jumps = sum(1 for prev, cur in zip(rects, rects[1:]) if cur[3] > prev[3] + (prev[3] - prev[1]))
+        info["disorder"] = jumps / len(rects) if rects else 0.0
+        textpage.close()
+        page.close()
+        return info
+    finally:
+        pdf.close()
+
+
+def choose_pdf_backend(probe):
+    """PDFium unless page 1 has no text layer or stores its text out of reading order, where pdfplumber's positional ordering wins"""
+    if not probe["chars"] or probe["disorder"] > DISORDER_THRESHOLD:
+        return "pdfplumber"
+    return "pypdfium2"
+
+
+def _extract_page_range(source, start, stop):
+    """Worker-process task: text of pages [start, stop) in order; source is a path or the PDF bytes"""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return "".join(iter_pdf_pages(source, range(start, stop)))
+
+
+def _noop():
+    return os.getpid()
+
+
+_pool = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def get_process_pool(processes):
+    """Shared page-extraction pool; spawn keeps children free of the parent's threads and sockets"""
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            _pool_size = processes
+        return _pool
+
+
+def warm_process_pool(processes):
+    """Start every worker up front so the first large PDF does not pay for interpreter start-up"""
+    pool = get_process_pool(processes)
+    for future in [pool.submit(_noop) for _ in range(processes)]:
+        future.result()
+
+
+def extract_pdf_parallel(source, processes, page_count=None):
+    """Fan page ranges out to the process pool and merge the text in page order"""
+    if page_count is None:
+        page_count = probe_pdf(source)["pages"]
+    if not isinstance(source, str):
+        # In-memory uploads travel to the workers as bytes
+        source = _rewind(source).read()
+    pool = get_process_pool(processes)
+    step = -(-page_count // _pool_size)
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    futures = [pool.submit(_extract_page_range, source, start, stop) for start, stop in ranges]
+    return "".join(future.result() for future in futures)
+
+
+def iter_docx_paragraphs(source):
+    """Yield the text of each non-empty DOCX paragraph (no python-docx needed).
+
+    document.xml is parsed incrementally straight from the zip member and each
+    paragraph, table and body child is discarded once read, so memory stays flat
+    on large exports and nothing past the point where the caller stops is parsed.
+    """
+    with zipfile.ZipFile(_rewind(source)) as docx, docx.open('word/document.xml') as xml:
+        depth = 0
+        body = None
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if elem.tag == W_BODY:
+                    body = elem
+                continue
+            depth -= 1
+            if elem.tag == W_PARAGRAPH:
+                # Deleted tracked-change text lives in w:delText, so only current text is kept
+                texts = [node.text for node in elem.iter(W_TEXT) if node.text]
+                # Clearing also keeps a text box's paragraphs from repeating in the enclosing one
+                elem.clear()
+                if texts:
+                    yield "".join(texts) + "\n"
+            if body is not None and depth == 2:
+                # A top-level paragraph, table or section just ended; drop it from the tree
+                body.clear()
+
+
+def extract_text(source, filename=None, max_chars=None, processes=0, min_parallel_pages=8, backend="auto", report=None):
+    """Extract text from a PDF or DOCX path or binary file object, stopping once max_chars have been collected.
+
+    backend picks the PDF extractor ("auto" probes the document first). If a
+    report dict is given it receives the backend used and the probe and
+    extraction times in seconds.
+    """
+    chunks = []
+    collected = 0
+    is_pdf = (filename or source).lower().endswith(".pdf")
+    report = {} if report is None else report
+    start = time.perf_counter()
+    try:
+        probe = None
+        if is_pdf:
+            if backend == "auto" or (max_chars is None and processes > 1 and backend == "pdfplumber"):
+                probe = probe_pdf(source)
+                report["probe_seconds"] = time.perf_counter() - start
+            if backend == "auto":
+                backend = choose_pdf_backend(probe)
+            report["backend"] = backend
+            # Whole large PDFs go to the process pool; small ones are cheaper serially
+            if max_chars is None and processes > 1 and backend == "pdfplumber" and probe["pages"] >= min_parallel_pages:
+                return extract_pdf_parallel(source, processes, probe["pages"]).strip()
+            pieces = PDF_BACKENDS[backend](source)
+        else:
+            report["backend"] = "docx"
+            pieces = iter_docx_paragraphs(source)
+        for piece in pieces:
+            chunks.append(piece)
+            collected += len(piece)
+            if max_chars is not None and collected >= max_chars:
+                pieces.close()
+                break
+    except Exception as e:
+        print(f"Extraction Error: {e}")
+    finally:
+        report["seconds"] = time.perf_counter() - start
+    return "".join(chunks).strip()
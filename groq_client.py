@@ -0,0 +1,95 @@
+import asyncio
+import os
+import threading
+
+import httpx
+
+import metrics
+
+
+class GroqPool:
+    """Process-wide Groq client sharing one keep-alive connection pool across threads"""
+
+    def __init__(self, api_key, pool_size=10, connect_timeout=5.0, read_timeout=60.0, keepalive_seconds=60.0, max_retries=2):
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.keepalive_seconds = keepalive_seconds
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._connections = 0
+
+    def _owner(self):
+        return os.getpid()
+
+    def _limits(self):
+        return httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size,
+                            keepalive_expiry=self.keepalive_seconds)
+
+    def _build(self):
+        # The SDK takes a quarter of a second to import; only pay for it once a client is needed
+        from groq import Groq
+        http = httpx.Client(timeout=self.timeout, limits=self._limits(), event_hooks={"request": [self._on_request]})
+        return Groq(api_key=self.api_key, http_client=http, timeout=self.timeout, max_retries=self.max_retries)
+
+    def client(self):
+        """Build the client on first use (and again after a fork, connections must not be shared)"""
+        owner = self._owner()
+        if self._pid != owner:
+            with self._lock:
+                if self._pid != owner:
+                    self._client = self._build()
+                    self._pid = owner
+        return self._client
+
+    def _on_request(self, request):
+        # httpcore reports connection lifecycle events through the "trace" extension
+        request.extensions["trace"] = self._trace
+        self._count_request()
+
+    def _count_request(self):
+        with self._lock:
+            self._requests += 1
+        metrics.GROQ_HTTP_REQUESTS.inc()
+
+    def _trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            self._count_connection()
+
+    def _count_connection(self):
+        with self._lock:
+            self._connections += 1
+        metrics.GROQ_CONNECTIONS.inc()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "new_connections": self._connections,
+                "reused_connections": max(self._requests - self._connections, 0),
+                "pool_size": self.pool_size,
+            }
+
+
+class AsyncGroqPool(GroqPool):
+    """AsyncGroq counterpart for the ASGI app: one connection pool per process and event loop"""
+
+    def _owner(self):
+        return os.getpid(), id(asyncio.get_running_loop())
+
+    def _build(self):
+        from groq import AsyncGroq
+        http = httpx.AsyncClient(timeout=self.timeout, limits=self._limits(),
+                                 event_hooks={"request": [self._on_request_async]})
+        return AsyncGroq(api_key=self.api_key, http_client=http, timeout=self.timeout, max_retries=self.max_retries)
+
+    async def _on_request_async(self, request):
+        request.extensions["trace"] = self._trace_async
+        self._count_request()
+
+    async def _trace_async(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            self._count_connection()
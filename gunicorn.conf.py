@@ -0,0 +1,47 @@
+# Picked up automatically by `gunicorn app:app` (Procfile / render.yaml)
+import os
+import shutil
+import tempfile
+
+# Prometheus multiprocess mode: each worker writes its samples here and /metrics merges them.
+# Must be set before any worker imports prometheus_client.
+prometheus_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "resume_metrics"))
+
+# Threaded workers: a long response (a streamed batch ZIP, a job's event stream) occupies one thread
+# while the worker keeps heartbeating, so it is not killed at `timeout` halfway through as a sync
+# worker would be, and other requests are still served. `-k` on the command line overrides this.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+
+# Import the app once in the master so workers fork with pdfplumber, reportlab, fonts and
+# the logo already loaded and share those pages copy-on-write. GUNICORN_PRELOAD=0 to
+# import per worker (needed for --reload).
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+# The preloaded import runs before on_starting and already opens the master's sample files
+os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be added to this one (the master's own
+    # files go too; it records nothing, and forked workers open fresh files per pid)
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    # Master only, before the first fork: everything in app.warm_up that is safe to share
+    if server.cfg.preload_app:
+        import app
+        app.warm_up(per_process=False)
+
+
+def post_worker_init(worker):
+    # Groq connections and the extraction process pool must belong to the worker; /readyz is 503 until done
+    import app
+    app.start_warm_up()
@@ -0,0 +1,155 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobStore:
+    """Conversion jobs persisted in SQLite so they survive worker restarts"""
+
+    def __init__(self, path, lease_seconds=600, max_attempts=3, ttl_seconds=86400):
+        self.path = path
+        self.lease = lease_seconds
+        self.max_attempts = max_attempts
+        self.ttl = ttl_seconds
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY, state TEXT NOT NULL, filename TEXT NOT NULL,
+                job_description TEXT NOT NULL, input BLOB, result_name TEXT, result BLOB,
+                error TEXT, progress TEXT, attempts INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL, updated REAL NOT NULL, lease_until REAL)""")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def submit(self, raw, filename, job_description=""):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as db:
+            db.execute("INSERT INTO jobs (id, state, filename, job_description, input, created, updated) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (job_id, QUEUED, filename, job_description, sqlite3.Binary(raw), now, now))
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as db:
+            row = db.execute("SELECT id, state, filename, result_name, error, progress, attempts, created, updated "
+                             "FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+        job = dict(row)
+        job["progress"] = json.loads(job["progress"]) if job["progress"] else None
+        return job
+
+    def result(self, job_id):
+        """Return (download_name, pdf_bytes) for a finished job"""
+        with self._connect() as db:
+            row = db.execute("SELECT result_name, result FROM jobs WHERE id = ? AND state = ?",
+                             (job_id, DONE)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def claim(self):
+        """Atomically take the oldest queued job, or one whose worker died mid-run"""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute("SELECT id, filename, job_description, input, attempts FROM jobs "
+                                 "WHERE state = ? OR (state = ? AND lease_until < ?) ORDER BY created LIMIT 1",
+                                 (QUEUED, RUNNING, now)).fetchone()
+                if not row:
+                    return None
+                if row["attempts"] >= self.max_attempts:
+                    db.execute("UPDATE jobs SET state = ?, error = ?, input = NULL, updated = ? WHERE id = ?",
+                               (FAILED, "gave up after repeated worker crashes", now, row["id"]))
+                    return None
+                db.execute("UPDATE jobs SET state = ?, attempts = attempts + 1, lease_until = ?, updated = ? "
+                           "WHERE id = ?", (RUNNING, now + self.lease, now, row["id"]))
+                return dict(row)
+            finally:
+                db.execute("COMMIT")
+
+    def progress(self, job_id, **progress):
+        now = time.time()
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET progress = ?, updated = ?, lease_until = ? WHERE id = ?",
+                       (json.dumps(progress), now, now + self.lease, job_id))
+
+    def finish(self, job_id, result_name, pdf):
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET state = ?, result_name = ?, result = ?, input = NULL, updated = ? "
+                       "WHERE id = ?", (DONE, result_name, sqlite3.Binary(pdf), time.time(), job_id))
+
+    def fail(self, job_id, error):
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET state = ?, error = ?, input = NULL, updated = ? WHERE id = ?",
+                       (FAILED, error, time.time(), job_id))
+
+    def prune(self):
+        """Forget finished jobs older than the TTL"""
+        with self._connect() as db:
+            db.execute("DELETE FROM jobs WHERE state IN (?, ?) AND updated < ?", (DONE, FAILED, time.time() - self.ttl))
+
+
+class JobWorkerPool:
+    """Background threads in this process that drain the shared job queue"""
+
+    def __init__(self, store, handler, workers=2, poll_interval=1.0):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self):
+        """Start the threads once per process (safe to call on every request); True on the first call"""
+        if self._pid == os.getpid():
+            return False
+        with self._lock:
+            if self._pid == os.getpid():
+                return False
+            self._pid = os.getpid()
+            for i in range(self.workers):
+                threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True).start()
+            return True
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        last_prune = 0
+        while True:
+            try:
+                if time.time() - last_prune > 300:
+                    self.store.prune()
+                    last_prune = time.time()
+                job = self.store.claim()
+            except sqlite3.Error as e:
+                print(f"Job Queue Error: {e}")
+                job = None
+            if not job:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            try:
+                result_name, pdf = self.handler(job)
+                self.store.finish(job["id"], result_name, pdf)
+            except Exception as e:
+                print(f"Job Error ({job['id']}): {e}")
+                self.store.fail(job["id"], str(e) or type(e).__name__)
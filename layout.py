@@ -0,0 +1,251 @@
+import copy
+import hashlib
+import os
+import re
+import threading
+import time
+
+from reportlab.lib.boxstuff import aspectRatioFix
+from reportlab.lib.colors import HexColor, black
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfdoc, pdfmetrics
+
+REGULAR = "Helvetica"
+BOLD = "Helvetica-Bold"
+BOLD_MARKUP = re.compile(r'(\*\*[^*]+\*\*)')
+WHITESPACE = re.compile(r'(\s+)')
+
+# Advance widths in 1/1000 em, one table per font, filled once per process
+_width_tables = {}
+# Memoised word widths (1/1000 em) per font; resumes repeat the same vocabulary heavily
+_word_widths = {}
+WORD_CACHE_LIMIT = 50000
+
+
+def width_table(font):
+    """Per-character advance widths for a font (Latin-1 precomputed, anything else added on first use)"""
+    table = _width_tables.get(font)
+    if table is None:
+        table = {chr(i): pdfmetrics.stringWidth(chr(i), font, 1000) for i in range(32, 256)}
+        _width_tables[font] = table
+    return table
+
+
+def preload_fonts(fonts=(REGULAR, BOLD)):
+    for font in fonts:
+        width_table(font)
+
+
+def text_width(text, font, size):
+    """Same result as canvas.stringWidth, from the cached table"""
+    table = width_table(font)
+    total = 0.0
+    for ch in text:
+        w = table.get(ch)
+        if w is None:
+            w = table[ch] = pdfmetrics.stringWidth(ch, font, 1000)
+        total += w
+    return total * size / 1000
+
+
+def word_width(word, font, size):
+    cache = _word_widths.setdefault(font, {})
+    units = cache.get(word)
+    if units is None:
+        if len(cache) >= WORD_CACHE_LIMIT:
+            cache.clear()
+        units = cache[word] = text_width(word, font, 1000)
+    return units * size / 1000
+
+
+def split_bold(text, regular=REGULAR, bold=BOLD):
+    """Turn '**bold** markup' into (font, text) runs"""
+    runs = []
+    for part in BOLD_MARKUP.split(text):
+        if not part: continue
+        if part.startswith('**') and part.endswith('**') and len(part) > 4:
+            runs.append((bold, part[2:-2]))
+        else:
+            runs.append((regular, part))
+    return runs
+
+
+def _words(runs):
+    """Group runs into words; a word can span fonts (e.g. '**Java**,')"""
+    words, word = [], []
+    for font, text in runs:
+        for piece in WHITESPACE.split(text):
+            if not piece: continue
+            if piece.isspace():
+                if word: words.append(word)
+                word = []
+            else:
+                word.append((font, piece))
+    if word: words.append(word)
+    return words
+
+
+def wrap_runs(runs, max_width, size):
+    """Greedy line wrap over mixed-font runs using a running line width.
+
+    Returns a list of lines, each a list of (font, text) runs with adjacent
+    same-font text merged so it can be drawn with one call per run.
+    """
+    lines, line, line_width = [], [], 0.0
+
+    def flush():
+        lines.append([(font, "".join(parts)) for font, parts in line])
+
+    for word in _words(runs):
+        width = sum(word_width(piece, font, size) for font, piece in word)
+        if line:
+            space = word_width(" ", word[0][0], size)
+            if line_width + space + width < max_width:
+                word = [(word[0][0], " ")] + word
+                line_width += space + width
+            else:
+                flush()
+                line, line_width = [], width
+        else:
+            line_width = width
+        for font, piece in word:
+            if line and line[-1][0] == font:
+                line[-1][1].append(piece)
+            else:
+                line.append((font, [piece]))
+    if line: flush()
+    return lines
+
+
+def draw_runs(c, x, y, runs, size, colors):
+    """Draw one wrapped line; colors maps font name -> fill colour"""
+    for font, text in runs:
+        c.setFont(font, size)
+        c.setFillColor(colors[font])
+        c.drawString(x, y, text)
+        x += text_width(text, font, size)
+
+
+class PageChrome:
+    """Border, logo and footer shared by every page, prepared once per process.
+
+    The logo is located and encoded into a PDF image object up front; each
+    document gets a copy of it and references the chrome as form XObjects
+    instead of redrawing it. static/ is re-checked at most every few seconds
+    so a replaced logo is picked up without a restart.
+    """
+    LOGO_FILES = ('krify_logo.png', 'krify_logo.jpg', 'krify_logo.jpeg')
+    CHECK_INTERVAL = 5.0
+    LOGO_W, LOGO_H = 1.2*inch, 0.6*inch
+
+    def __init__(self, static_dir):
+        self.static_dir = static_dir
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._signature = None
+        self._logo = None
+        self._logo_signature = None
+        self.refresh()
+
+    def _current_signature(self):
+        try:
+            signature = [os.stat(self.static_dir).st_mtime_ns]
+        except OSError:
+            return None
+        if self._logo is not None:
+            try:
+                signature.append(os.stat(self._logo.path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def refresh(self):
+        """Reload the logo if static/ or the logo file changed since the last look"""
+        now = time.monotonic()
+        if now - self._checked < self.CHECK_INTERVAL and self._signature is not None:
+            return
+        with self._lock:
+            self._checked = now
+            signature = self._current_signature()
+            if signature == self._signature and signature is not None:
+                return
+            logo = None
+            for name in self.LOGO_FILES:
+                path = os.path.join(self.static_dir, name)
+                if os.path.exists(path):
+                    try:
+                        # PDF resource names must be plain tokens, so name the image by digest like drawImage does
+                        name = hashlib.md5(path.encode("utf-8")).hexdigest()
+                        logo = pdfdoc.PDFImageXObject(name, path, mask='auto')
+                        logo.name, logo.path = name, path
+                    except Exception as e:
+                        print(f"Logo Error: {e}")
+                    break
+            self._logo = logo
+            self._signature = self._current_signature()
+            self._logo_signature = (logo.path, self._signature[-1]) if logo and self._signature else None
+
+    @property
+    def has_logo(self):
+        return self._logo is not None
+
+    @property
+    def signature(self):
+        """(path, mtime) of the logo being drawn, or None; cached PDFs are keyed on it"""
+        self.refresh()
+        return self._logo_signature
+
+    def _embed_logo(self, c):
+        """Register a copy of the pre-encoded logo in this document (what drawImage does internally)"""
+        # Copies, because registering tags the object with its id in that one document
+        img = copy.copy(self._logo)
+        reg_name = c._doc.getXObjectName(img.name)
+        if reg_name not in c._doc.idToObject:
+            c._setXObjects(img)
+            c._doc.Reference(img, reg_name)
+            c._doc.addForm(img.name, img)
+            smask = getattr(img, '_smask', None)
+            if smask:
+                smask = copy.copy(smask)
+                c._setXObjects(smask)
+                img.smask = c._doc.Reference(smask, c._doc.getXObjectName(smask.name))
+                del img._smask
+        return img, reg_name
+
+    def define_forms(self, c, width, height, margin):
+        """Add the 'border', 'logo' and 'footer' forms to a canvas; returns the logo block height"""
+        self.refresh()
+        c.beginForm("border")
+        c.setStrokeColor(HexColor('#2980B9'))
+        c.setLineWidth(1)
+        c.rect(margin, margin, width - 2*margin, height - 2*margin)
+        c.endForm()
+
+        top = height - margin - 0.4*inch
+        c.beginForm("logo")
+        if self._logo is not None:
+            img, reg_name = self._embed_logo(c)
+            x, y, w, h, _ = aspectRatioFix(True, 'c', (width - self.LOGO_W)/2, top - self.LOGO_H,
+                                           self.LOGO_W, self.LOGO_H, img.width, img.height)
+            c.saveState()
+            c.translate(x, y)
+            c.scale(w, h)
+            c._code.append("/%s Do" % reg_name)
+            c.restoreState()
+            c._formsinuse.append(img.name)
+            block = self.LOGO_H + 0.3*inch
+        else:
+            c.setFont("Helvetica-Bold", 18)
+            c.setFillColor(HexColor('#003765'))
+            c.drawCentredString(width/2, top, "KRIFY")
+            block = 0.5*inch
+        c.endForm()
+
+        c.beginForm("footer")
+        c.setFont("Helvetica-Bold", 8)
+        c.setFillColor(black)
+        c.drawString(margin + 0.2*inch, margin + 0.4*inch, "Private and Confidential Document – Intended for authorized organizations only.")
+        c.setFont("Helvetica", 8)
+        c.drawString(margin + 0.2*inch, margin + 0.25*inch, "info@krify.com")
+        c.endForm()
+        return block
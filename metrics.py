@@ -0,0 +1,93 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+
+# Under gunicorn, PROMETHEUS_MULTIPROC_DIR is set by gunicorn.conf.py so every worker's
+# samples land on disk and /metrics reports the sum across workers.
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_seconds", "Time spent in each conversion stage", ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+LLM_TOKENS = Counter("resume_llm_tokens_total", "Tokens reported in Groq usage", ["kind"])
+EXTRACTED_CHARS = Histogram(
+    "resume_extracted_text_chars", "Characters of text extracted per resume",
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000),
+)
+EXTRACT_SECONDS = Histogram(
+    "resume_extract_backend_seconds", "Text extraction time by backend", ["backend"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+PROMPT_TEXT_TOKENS = Histogram(
+    "resume_prompt_text_tokens", "Estimated tokens of resume text sent to the model after compression",
+    buckets=(100, 250, 500, 750, 1000, 1500, 2000, 3000, 4000, 8000),
+)
+PROBE_SECONDS = Histogram(
+    "resume_extract_probe_seconds", "Time spent probing PDFs to pick an extractor",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+CONVERSIONS = Counter("resume_conversions_total", "Conversions by outcome", ["outcome"])
+LLM_MODEL_SECONDS = Histogram(
+    "resume_llm_model_seconds", "Groq call time by model and outcome (ok, error, cancelled)", ["model", "outcome"],
+    buckets=(0.5, 1, 2, 3, 5, 8, 12, 20, 30, 45, 60, 120),
+)
+LLM_SECTION_SECONDS = Histogram(
+    "resume_llm_section_seconds", "Groq call time per sub-prompt when LLM_SECTIONED is on", ["section"],
+    buckets=(0.5, 1, 2, 3, 5, 8, 12, 20, 30, 45, 60, 120),
+)
+LLM_TIER = Counter("resume_llm_tier_total", "Which model tier served each conversion, and why", ["tier", "reason"])
+LLM_HEDGES = Counter("resume_llm_hedges_total", "Hedged requests started on the fast model after the SLO passed")
+LLM_FOLLOWUPS = Counter("resume_llm_followups_total", "Follow-up requests for fields missing from JSON replies")
+CONTACT_FIELDS = Counter("resume_contact_fields_total", "Where each contact field came from", ["field", "source"])
+CACHE_LOOKUPS = Counter("resume_cache_lookups_total", "Result cache lookups", ["result"])
+EXTRACTION_CACHE_LOOKUPS = Counter(
+    "resume_extraction_cache_lookups_total", "Lookups of the job-description-agnostic extraction cache", ["result"])
+GROQ_HTTP_REQUESTS = Counter("resume_groq_http_requests_total", "HTTP requests sent to Groq")
+GROQ_QUEUE_SECONDS = Histogram(
+    "resume_groq_queue_seconds", "Time Groq calls waited for rate-limit budget",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+GROQ_RETRIES = Counter("resume_groq_retries_total", "Groq calls retried after a 429 or transient error", ["reason"])
+GROQ_CONNECTIONS = Counter("resume_groq_connections_total", "New TCP connections opened to Groq")
+
+
+def observe(stage, seconds):
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+@contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def record_usage(usage):
+    """Count prompt/completion/total tokens from a Groq usage object"""
+    if not usage: return
+    for kind in ("prompt", "completion", "total"):
+        value = getattr(usage, f"{kind}_tokens", None)
+        if value:
+            LLM_TOKENS.labels(kind).inc(value)
+
+
+def record_extraction(report):
+    """Per-backend timing from an extract_text report dict"""
+    if "backend" in report:
+        EXTRACT_SECONDS.labels(report["backend"]).observe(report["seconds"])
+    if "probe_seconds" in report:
+        PROBE_SECONDS.observe(report["probe_seconds"])
+
+
+def exposition():
+    """(body, content_type) for the /metrics endpoint"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
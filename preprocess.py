@@ -0,0 +1,302 @@
+import re
+
+# Contact fields: a cheap deterministic pass over extracted text. Each field comes back as
+# (value, confidence 0-1); confident ones are filled locally instead of being asked of the model.
+
+EMAIL = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}')
+PHONE = re.compile(r'(?<![\w/])(\+?\(?\d[\d\s().-]{6,}\d)(?![\w/])')
+YEAR_RANGE = re.compile(r'^(19|20)\d\d\s*[-.]\s*(19|20)\d\d$')
+LABEL = re.compile(r'^\s*(?P<label>[A-Za-z ]{2,20}?)\s*[:\-]\s*(?P<value>.+)$')
+SEPARATORS = re.compile(r'\s*(?:\||•|·|◦|▪|\t|\s{3,})\s*')
+NAME_WORD = re.compile(r"^[A-Z][A-Za-z'\-]*\.?$|^[A-Z]\.$")
+CITY_REGION = re.compile(r"^[A-Z][A-Za-z .'\-]{1,30},\s*[A-Z][A-Za-z .]{1,30}$")
+
+US_STATES = set("""AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV NH NJ NM
+NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY DC""".split())
+COUNTRIES = {"india", "usa", "united states", "uk", "united kingdom", "canada", "australia", "germany",
+             "singapore", "uae", "united arab emirates", "ireland", "netherlands", "france", "new zealand"}
+PHONE_LABELS = ("phone", "mobile", "mob", "tel", "telephone", "contact", "cell")
+LOCATION_LABELS = ("location", "address", "city", "based in", "current location")
+NAME_LABELS = ("name", "full name", "candidate name")
+# Lines at the top of a resume that are never the candidate's name
+NOT_NAMES = {"resume", "curriculum vitae", "cv", "profile", "summary", "professional summary", "profile summary",
+             "contact", "contact details", "personal details", "objective", "career objective", "biodata",
+             "experience", "work experience", "professional experience", "education", "skills",
+             "technical skills", "projects", "project experience"}
+# Capitalised header lines made of these are job titles, not names
+TITLE_WORDS = {"developer", "engineer", "manager", "analyst", "consultant", "designer", "architect", "lead",
+               "senior", "junior", "intern", "specialist", "administrator", "officer", "executive", "director",
+               "scientist", "tester", "programmer", "associate", "head", "skilled", "experienced", "full",
+               "stack", "software", "data", "java", "python", "web", "frontend", "backend", "devops"}
+NAME_TITLE_SPLIT = re.compile(r'\s+[-–—,]\s+')
+HEADER_LINES = 8
+
+
+def _header(text):
+    """First few non-empty lines, where contact details almost always sit"""
+    lines = []
+    for line in text.splitlines():
+        if line.strip():
+            lines.append(line.strip())
+            if len(lines) == HEADER_LINES:
+                break
+    return lines
+
+
+def _labelled(lines, labels):
+    for line in lines:
+        for segment in SEPARATORS.split(line):
+            match = LABEL.match(segment)
+            if match and match.group("label").strip().lower() in labels:
+                return match.group("value").strip()
+    return None
+
+
+def find_email(text):
+    emails = list(dict.fromkeys(e.rstrip(".") for e in EMAIL.findall(text)))
+    if not emails:
+        return "", 0.0
+    # Several addresses (referees, former employers) make the first one a guess
+    return emails[0], 0.99 if len(emails) == 1 else 0.8
+
+
+def find_phone(text, header):
+    labelled = _labelled(header, PHONE_LABELS)
+    for source, base in ((labelled, 0.97), ("\n".join(header), 0.92), (text, 0.75)):
+        if not source:
+            continue
+        for match in PHONE.finditer(source):
+            number = match.group(1).strip()
+            digits = sum(ch.isdigit() for ch in number)
+            if YEAR_RANGE.match(number) or not 7 <= digits <= 15:
+                continue
+            # 7-9 digits is plausible for a local number but also for IDs and dates
+            return number, base if digits >= 10 else base - 0.3
+    return "", 0.0
+
+
+def find_location(header):
+    labelled = _labelled(header, LOCATION_LABELS)
+    if labelled:
+        return labelled, 0.9
+    for line in header:
+        for segment in SEPARATORS.split(line):
+            if "@" in segment or any(ch.isdigit() for ch in segment) or not CITY_REGION.match(segment):
+                continue
+            region = segment.rsplit(",", 1)[1].strip()
+            if region.upper() in US_STATES or region.lower() in COUNTRIES:
+                return segment, 0.88
+            return segment, 0.6
+    return "", 0.0
+
+
+def find_name(header, email):
+    labelled = _labelled(header, NAME_LABELS)
+    if labelled:
+        return labelled, 0.9
+    # Banners like "RESUME" do not count against the line that follows them
+    lines = [line for line in header if line.lower().strip(": ") not in NOT_NAMES]
+    for position, line in enumerate(lines[:3]):
+        # "JANE DOE - JAVA DEVELOPER" style headers carry the title after a dash
+        candidate = NAME_TITLE_SPLIT.split(SEPARATORS.split(line)[0].strip())[0]
+        words = candidate.split()
+        if candidate.lower() in NOT_NAMES or not 2 <= len(words) <= 4:
+            continue
+        if any(w.lower().strip(".") in TITLE_WORDS for w in words):
+            continue
+        if not all(NAME_WORD.match(w) or (w.isupper() and w.isalpha()) for w in words):
+            continue
+        confidence = 0.9 if position == 0 else 0.75
+        # The name usually reappears in the email address
+        local = email.split("@")[0].lower()
+        if local and any(len(w) > 2 and w.lower().strip(".") in local for w in words):
+            confidence = round(min(confidence + 0.07, 0.97), 2)
+        name = candidate.title() if candidate.isupper() else candidate
+        return name, confidence
+    return "", 0.0
+
+
+def extract_contacts(text):
+    """{'Full Name'|'Email'|'Phone'|'Location': (value, confidence)} from resume text"""
+    header = _header(text)
+    email = find_email(text)
+    return {
+        "Full Name": find_name(header, email[0]),
+        "Email": email,
+        "Phone": find_phone(text, header),
+        "Location": find_location(header),
+    }
+
+
+# Prompt text compression: fit extracted text into a token budget without cutting blindly.
+# Boilerplate and whitespace go first, then low-value sections, then the tail of each section
+# (resumes are reverse-chronological, so the most recent entries lead).
+
+WORD_PIECES = re.compile(r'[A-Za-z]+|\d+|[^\sA-Za-z\d]')
+NON_SPACE = re.compile(r'\S+')
+SPACE_RUNS = re.compile(r'[ \t\u00a0\u2000-\u200b\u3000]+')
+CID_GLYPH = re.compile(r'\(cid:\d+\)')
+PAGE_NUMBER = re.compile(r'^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$', re.I)
+DIGITS = re.compile(r'\d+')
+# Heading vocabulary -> priority (higher is kept longer; 0 is dropped first when over budget)
+SECTION_PRIORITY = [
+    (("experience", "employment", "work history", "career history"), 5),
+    (("summary", "profile", "objective", "about me"), 4),
+    (("skills", "technologies", "technical", "competencies", "tools"), 4),
+    (("projects", "project"), 3),
+    (("education", "qualification", "academic"), 2),
+    (("certification", "certificate", "training", "courses", "awards", "achievements", "publications"), 1),
+    (("references", "referees", "hobbies", "interests", "declaration", "personal details",
+      "personal information", "languages known", "extra-curricular", "extracurricular"), 0),
+]
+HEADING_MAX_WORDS = 5
+# The header (name and contact lines before the first heading) always survives, up to this many tokens
+PREAMBLE_TOKENS = 120
+# Every kept section keeps at least its heading and first lines
+SECTION_MIN_TOKENS = 40
+BOILERPLATE_EDGE_LINES = 3
+
+
+def estimate_tokens(text):
+    """Rough Llama-style token count without a tokenizer: words by length, numbers in 3-digit groups, 1 per symbol"""
+    tokens = 0
+    for piece in WORD_PIECES.findall(text):
+        if piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            tokens += (len(piece) + 2) // 3
+        else:
+            tokens += 1
+    return tokens
+
+
+def _normalise(line):
+    return SPACE_RUNS.sub(" ", CID_GLYPH.sub("-", line)).strip()
+
+
+def _strip_boilerplate(pages):
+    """Drop page numbers and lines repeated at the top or bottom of most pages (running headers/footers)"""
+    pages = [[_normalise(line) for line in page.splitlines()] for page in pages]
+    pages = [[line for line in page if line and not PAGE_NUMBER.match(line)] for page in pages]
+    if len(pages) < 2:
+        return pages
+    seen = {}
+    for page in pages:
+        edges = page[:BOILERPLATE_EDGE_LINES] + page[-BOILERPLATE_EDGE_LINES:]
+        # "Page 3 of 7" and dated footers only differ in their digits
+        for key in {DIGITS.sub("#", line.lower()) for line in edges}:
+            seen[key] = seen.get(key, 0) + 1
+    repeated = {key for key, count in seen.items() if count >= max(2, len(pages) / 2)}
+    if not repeated:
+        return pages
+    emitted = set()
+    cleaned = []
+    for page in pages:
+        kept = []
+        for i, line in enumerate(page):
+            key = DIGITS.sub("#", line.lower())
+            if key in repeated and (i < BOILERPLATE_EDGE_LINES or i >= len(page) - BOILERPLATE_EDGE_LINES):
+                # Keep the first copy so a header that carries the candidate's name is not lost entirely
+                if key in emitted:
+                    continue
+                emitted.add(key)
+            kept.append(line)
+        cleaned.append(kept)
+    return cleaned
+
+
+def section_priority(line):
+    """Priority of a heading line, or None if the line is not a section heading"""
+    heading = line.strip().rstrip(":").strip()
+    words = heading.split()
+    if not words or len(words) > HEADING_MAX_WORDS or heading.endswith((".", ",")):
+        return None
+    lower = heading.lower()
+    # Headings are set apart typographically; in plain text that shows as capitals or a trailing colon
+    if not (heading.isupper() or line.rstrip().endswith(":") or heading.istitle() or len(words) <= 2):
+        return None
+    for words_, priority in SECTION_PRIORITY:
+        if any(word in lower for word in words_):
+            return priority
+    return None
+
+
+def split_sections(lines):
+    """[(priority, lines)], the first entry being the preamble (priority None) before any heading"""
+    sections = [[None, []]]
+    for line in lines:
+        priority = section_priority(line)
+        if priority is not None:
+            sections.append([priority, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(priority, body) for priority, body in sections if body]
+
+
+def _truncate(line, budget):
+    """Leading words of line that fit in budget tokens"""
+    end, used = 0, 0
+    for word in NON_SPACE.finditer(line):
+        used += estimate_tokens(word.group())
+        if used > budget:
+            break
+        end = word.end()
+    return line[:end]
+
+
+def _take(lines, budget):
+    """Leading lines of a section that fit in budget tokens; the line that overflows is cut at a word boundary"""
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            # One long paragraph (or a document without line breaks) must still be cut, not kept whole or lost
+            line = _truncate(line, budget - used - 1)
+            if line:
+                kept.append(line)
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def compress_resume(text, token_budget):
+    """Normalised, de-duplicated resume text that fits token_budget (estimated), cut at section and line boundaries"""
+    pages = _strip_boilerplate(text.split("\f"))
+    lines = []
+    for page in pages:
+        for line in page:
+            # Consecutive duplicate lines are extraction artefacts (overprinted bold text, repeated table headers)
+            if not lines or line != lines[-1]:
+                lines.append(line)
+    compact = "\n".join(lines)
+    if estimate_tokens(compact) + len(lines) <= token_budget:
+        return compact
+
+    sections = split_sections(lines)
+    costs = [sum(estimate_tokens(line) + 1 for line in body) for _, body in sections]
+    allowance = [0] * len(sections)
+    remaining = token_budget
+    if sections[0][0] is None:
+        allowance[0] = min(costs[0], PREAMBLE_TOKENS)
+        remaining -= allowance[0]
+    # Highest-priority sections first (ties in document order); low-value ones only get what is left
+    order = sorted((i for i, (priority, _) in enumerate(sections) if priority is not None),
+                   key=lambda i: (-sections[i][0], i))
+    for i in order:
+        if sections[i][0] > 0:
+            allowance[i] = min(costs[i], SECTION_MIN_TOKENS, max(remaining, 0))
+            remaining -= allowance[i]
+    for i in order:
+        extra = min(costs[i] - allowance[i], max(remaining, 0))
+        allowance[i] += extra
+        remaining -= extra
+    if sections[0][0] is None:
+        # Unused budget goes back to the preamble, which is everything when no headings were found
+        allowance[0] += min(costs[0] - allowance[0], max(remaining, 0))
+
+    kept = []
+    for (_, body), budget in zip(sections, allowance):
+        if budget > 0:
+            kept.extend(_take(body, budget))
+    return "\n".join(kept)
@@ -0,0 +1,215 @@
+import asyncio
+import os
+import random
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import metrics
+
+RESET_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+RESET_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+class RateLimitTimeout(Exception):
+    pass
+
+
+def retryable():
+    """Failures worth waiting out; anything else (bad request, auth) fails straight away"""
+    import groq  # the SDK is imported on first use, see groq_client
+    return groq.RateLimitError, groq.InternalServerError, groq.APIConnectionError
+
+
+def parse_reset(value):
+    """Groq reset headers look like '2m59.56s', '7.66s' or '420ms'; returns seconds"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        parts = RESET_PART.findall(value)
+        return sum(float(n) * RESET_UNITS[unit] for n, unit in parts) if parts else None
+
+
+class RateLimiter:
+    """Request and token buckets per model, shared by every worker on the host through SQLite.
+
+    Buckets start from configured per-minute limits (0 = unknown, not enforced)
+    and are corrected by the x-ratelimit-* headers of every response: remaining
+    becomes the current level and the refill rate is derived from the reset
+    time. Calls that do not fit wait in line instead of failing; 429s and 5xx
+    replies are retried with jittered exponential backoff, and a 429's
+    retry-after pauses every worker, not just the one that hit it.
+    """
+
+    def __init__(self, path, rpm=0, tpm=0, max_wait=120.0, retries=5, backoff_base=0.5, backoff_cap=20.0):
+        self.path = path
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait = max_wait
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS buckets (
+                name TEXT PRIMARY KEY, level REAL NOT NULL, capacity REAL NOT NULL,
+                rate REAL NOT NULL, updated REAL NOT NULL)""")
+            db.execute("CREATE TABLE IF NOT EXISTS pauses (model TEXT PRIMARY KEY, until REAL NOT NULL)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def _defaults(self, model):
+        return {f"{model}:requests": self.rpm, f"{model}:tokens": self.tpm}
+
+    def reserve(self, model, tokens):
+        """Take one request and `tokens` from the model's buckets; returns 0, or the seconds to wait before asking again"""
+        now = time.time()
+        costs = {f"{model}:requests": 1, f"{model}:tokens": tokens}
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                pause = db.execute("SELECT until FROM pauses WHERE model = ?", (model,)).fetchone()
+                if pause and pause[0] > now:
+                    return pause[0] - now
+                levels = {}
+                for name, per_minute in self._defaults(model).items():
+                    row = db.execute("SELECT level, capacity, rate, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+                    if row is None:
+                        if not per_minute:
+                            continue
+                        row = (per_minute, per_minute, per_minute / 60.0, now)
+                    level, capacity, rate, updated = row
+                    levels[name] = (min(capacity, level + rate * (now - updated)), capacity, rate)
+                wait = 0.0
+                for name, (level, capacity, rate) in levels.items():
+                    # A single call larger than the whole bucket only has to wait for a full one
+                    cost = min(costs[name], capacity)
+                    if level < cost:
+                        wait = max(wait, (cost - level) / rate if rate > 0 else 1.0)
+                for name, (level, capacity, rate) in levels.items():
+                    if not wait:
+                        level -= min(costs[name], capacity)
+                    db.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?, ?)", (name, level, capacity, rate, now))
+                return wait
+            finally:
+                db.execute("COMMIT")
+
+    def observe(self, model, headers):
+        """Resynchronise the buckets from a response's rate-limit headers (the provider's view is authoritative)"""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                for kind in ("requests", "tokens"):
+                    limit = headers.get(f"x-ratelimit-limit-{kind}")
+                    remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                    if limit is None or remaining is None:
+                        continue
+                    limit, remaining = float(limit), float(remaining)
+                    reset = parse_reset(headers.get(f"x-ratelimit-reset-{kind}"))
+                    # The bucket is full again after `reset`; without one assume a one-minute window
+                    rate = (limit - remaining) / reset if reset else limit / 60.0
+                    db.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?, ?)",
+                               (f"{model}:{kind}", remaining, limit, max(rate, limit / 86400.0), now))
+                retry_after = parse_reset(headers.get("retry-after"))
+                if retry_after:
+                    db.execute("INSERT OR REPLACE INTO pauses VALUES (?, ?)", (model, now + retry_after))
+            except ValueError:
+                pass
+            finally:
+                db.execute("COMMIT")
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, never shorter than the server's retry-after"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    def acquire(self, model, tokens, deadline):
+        """Block until the call fits the shared budget; the wait is reported as queue time"""
+        start = time.monotonic()
+        while True:
+            wait = self.reserve(model, tokens)
+            if not wait:
+                break
+            if time.monotonic() + wait > deadline:
+                metrics.GROQ_QUEUE_SECONDS.observe(time.monotonic() - start)
+                raise RateLimitTimeout(f"Groq rate limit: no capacity for {model} within {self.max_wait:.0f}s")
+            # Jitter so workers queued behind the same limit do not all wake at once
+            time.sleep(wait * random.uniform(1.0, 1.2))
+        metrics.GROQ_QUEUE_SECONDS.observe(time.monotonic() - start)
+
+    def _retry_delay(self, model, error, attempt, deadline):
+        """Seconds to wait before retrying a failed call, or None when it should fail"""
+        response = getattr(error, "response", None)
+        retry_after = None
+        if response is not None:
+            self.observe(model, response.headers)
+            retry_after = parse_reset(response.headers.get("retry-after"))
+        if attempt >= self.retries:
+            return None
+        delay = self.backoff(attempt, retry_after)
+        if time.monotonic() + delay > deadline:
+            return None
+        metrics.GROQ_RETRIES.labels("rate_limited" if isinstance(error, retryable()[0]) else "error").inc()
+        return delay
+
+    def create(self, client, tokens, **kwargs):
+        """client.chat.completions.create(**kwargs) within the rate limits, retrying transient failures"""
+        model = kwargs["model"]
+        deadline = time.monotonic() + self.max_wait
+        attempt = 0
+        while True:
+            self.acquire(model, tokens, deadline)
+            try:
+                raw = client.chat.completions.with_raw_response.create(**kwargs)
+            except retryable() as e:
+                delay = self._retry_delay(model, e, attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self.observe(model, raw.headers)
+            return raw.parse()
+
+    async def acquire_async(self, model, tokens, deadline):
+        """acquire for the event loop: SQLite work runs on a thread and waiting does not block other requests"""
+        start = time.monotonic()
+        while True:
+            wait = await asyncio.to_thread(self.reserve, model, tokens)
+            if not wait:
+                break
+            if time.monotonic() + wait > deadline:
+                metrics.GROQ_QUEUE_SECONDS.observe(time.monotonic() - start)
+                raise RateLimitTimeout(f"Groq rate limit: no capacity for {model} within {self.max_wait:.0f}s")
+            await asyncio.sleep(wait * random.uniform(1.0, 1.2))
+        metrics.GROQ_QUEUE_SECONDS.observe(time.monotonic() - start)
+
+    async def create_async(self, client, tokens, **kwargs):
+        """create for an AsyncGroq client"""
+        model = kwargs["model"]
+        deadline = time.monotonic() + self.max_wait
+        attempt = 0
+        while True:
+            await self.acquire_async(model, tokens, deadline)
+            try:
+                raw = await client.chat.completions.with_raw_response.create(**kwargs)
+            except retryable() as e:
+                delay = await asyncio.to_thread(self._retry_delay, model, e, attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            await asyncio.to_thread(self.observe, model, raw.headers)
+            return await raw.parse()
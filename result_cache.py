@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+
+class ResultCache:
+    """Content-addressed PDF cache in SQLite, shared by every worker on the host.
+
+    Also keeps the job-description-agnostic structured extraction of each
+    resume, so tailoring the same candidate to another role skips re-extraction.
+    """
+
+    def __init__(self, path, max_bytes, max_age_seconds):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age_seconds
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY, name TEXT NOT NULL, pdf BLOB NOT NULL,
+                size INTEGER NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)""")
+            db.execute("""CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY, data TEXT NOT NULL, created REAL NOT NULL)""")
+            db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            db.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def key(source, *parts):
+        """SHA-256 of the uploaded bytes (or seekable file) combined with every input that changes the output"""
+        if isinstance(source, (bytes, bytearray)):
+            digest = hashlib.sha256(source).digest()
+        else:
+            content = hashlib.sha256()
+            source.seek(0)
+            for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                content.update(chunk)
+            source.seek(0)
+            digest = content.digest()
+        h = hashlib.sha256(digest)
+        for part in parts:
+            h.update(b"\0" + str(part).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key):
+        """Return (download_name, pdf_bytes) or None, counting the hit or miss"""
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT name, pdf, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row and now - row[2] > self.max_age:
+                db.execute("DELETE FROM results WHERE key = ?", (key,))
+                row = None
+            if row:
+                db.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, key))
+            db.execute("UPDATE counters SET value = value + 1 WHERE name = ?", ("hits" if row else "misses",))
+        return (row[0], row[1]) if row else None
+
+    def put(self, key, name, pdf):
+        now = time.time()
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                       (key, name, sqlite3.Binary(pdf), len(pdf), now, now))
+            self._evict(db, now)
+
+    def get_data(self, key):
+        """Return a cached extraction dict or None"""
+        with self._connect() as db:
+            row = db.execute("SELECT data FROM extractions WHERE key = ? AND created >= ?",
+                             (key, time.time() - self.max_age)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_data(self, key, data):
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO extractions VALUES (?, ?, ?)", (key, json.dumps(data), time.time()))
+
+    def _evict(self, db, now):
+        """Drop expired entries, then least recently used ones until under the size cap"""
+        db.execute("DELETE FROM results WHERE created < ?", (now - self.max_age,))
+        db.execute("DELETE FROM extractions WHERE created < ?", (now - self.max_age,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM results ORDER BY last_used").fetchall():
+            db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        with self._connect() as db:
+            counters = dict(db.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            extractions = db.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "hits": counters["hits"], "misses": counters["misses"],
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries, "bytes": size, "max_bytes": self.max_bytes, "extractions": extractions,
+        }
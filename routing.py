@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, TimeoutError, wait
+
+import metrics
+
+
+class Cancelled(Exception):
+    """Raised inside a call whose hedge partner already won"""
+
+
+def _in_thread(fn, *args):
+    """Run fn on its own daemon thread; unlike a pool, a hedge can never queue behind busy workers"""
+    future = Future()
+
+    def run():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    threading.Thread(target=run, name="llm-call", daemon=True).start()
+    return future
+
+
+class ModelRouter:
+    """Picks the model for each resume and hedges slow primary calls with the fast model.
+
+    Inputs up to fast_max_tokens (estimated) go straight to the fast model, as
+    do requests whose latency budget the primary has recently been too slow
+    for. Otherwise the primary runs, and if it has not finished within the SLO
+    (or the request's budget, if tighter) the same call is started on the fast
+    model and whichever completes first is used. A call that fails on one
+    model is retried on the other.
+    """
+    SMOOTHING = 0.2
+
+    def __init__(self, primary, fast=None, fast_max_tokens=0, slo_seconds=0.0):
+        self.primary = primary
+        self.fast = fast if fast and fast != primary else None
+        self.fast_max_tokens = fast_max_tokens
+        self.slo = slo_seconds
+        self._latency = {}
+        self._lock = threading.Lock()
+
+    def expected_latency(self, model):
+        with self._lock:
+            return self._latency.get(model)
+
+    def _record(self, model, seconds, outcome="ok"):
+        metrics.LLM_MODEL_SECONDS.labels(model, outcome).observe(seconds)
+        with self._lock:
+            last = self._latency.get(model)
+            if outcome != "ok" and last is not None:
+                # A cancelled or failed call only shows the latency is at least this much;
+                # a hedge loser stopped early or a quick 4xx must not pull the average down
+                seconds = max(last, seconds)
+            self._latency[model] = seconds if last is None else last + self.SMOOTHING * (seconds - last)
+
+    def choose(self, tokens, budget=None):
+        """(model, tier, reason) for an input of `tokens` estimated tokens"""
+        if self.fast:
+            if tokens <= self.fast_max_tokens:
+                return self.fast, "fast", "small_input"
+            expected = self.expected_latency(self.primary)
+            if budget and expected and expected > budget:
+                return self.fast, "fast", "budget"
+        return self.primary, "primary", "default"
+
+    def _timed(self, call, model, cancel, lead):
+        # Failed and cancelled calls are recorded too: a primary that keeps losing
+        # hedges must still push its expected latency up
+        start, outcome = time.perf_counter(), "error"
+        try:
+            result = call(model, cancel, lead)
+            outcome = "ok"
+            return result
+        except Cancelled:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._record(model, time.perf_counter() - start, outcome)
+
+    def run(self, call, tokens, budget=None, report=None):
+        """call(model, cancel_event, lead) -> result; lead is False for the hedge, which should not report progress"""
+        report = {} if report is None else report
+        model, tier, reason = self.choose(tokens, budget)
+        hedge_after = min([t for t in (self.slo, budget) if t] or [0])
+        if not self.fast:
+            return self._served(report, model, tier, reason, self._timed(call, model, None, True))
+        if tier == "fast":
+            try:
+                result = self._timed(call, model, None, True)
+            except Exception as e:
+                print(f"AI Error ({model}): {e}; falling back to {self.primary}")
+                return self._served(report, self.primary, "primary", "fallback", self._timed(call, self.primary, None, True))
+            return self._served(report, model, tier, reason, result)
+        if not hedge_after:
+            try:
+                result = self._timed(call, model, None, True)
+            except Exception as e:
+                print(f"AI Error ({model}): {e}; falling back to {self.fast}")
+                return self._served(report, self.fast, "fast", "fallback", self._timed(call, self.fast, None, True))
+            return self._served(report, model, tier, reason, result)
+
+        cancels = {model: threading.Event(), self.fast: threading.Event()}
+        primary = _in_thread(self._timed, call, model, cancels[model], True)
+        try:
+            return self._served(report, model, tier, reason, primary.result(timeout=hedge_after))
+        except TimeoutError:
+            pass
+        except Exception as e:
+            print(f"AI Error ({model}): {e}; falling back to {self.fast}")
+            return self._served(report, self.fast, "fast", "fallback", self._timed(call, self.fast, None, True))
+
+        report["hedged"] = True
+        metrics.LLM_HEDGES.inc()
+        hedge = _in_thread(self._timed, call, self.fast, cancels[self.fast], False)
+        pending = {primary: (model, tier, "default"), hedge: (self.fast, "fast", "hedge")}
+        error = None
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                served_model, served_tier, served_reason = pending.pop(future)
+                if future.exception() is None:
+                    # Stop the loser so it does not hold a connection or rate-limit budget
+                    for other in cancels:
+                        if other != served_model:
+                            cancels[other].set()
+                    return self._served(report, served_model, served_tier, served_reason, future.result())
+                error = future.exception()
+        raise error
+
+    async def _timed_async(self, call, model, lead):
+        start, outcome = time.perf_counter(), "error"
+        try:
+            result = await call(model, lead)
+            outcome = "ok"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._record(model, time.perf_counter() - start, outcome)
+
+    async def run_async(self, call, tokens, budget=None, report=None):
+        """run for the event loop: call(model, lead) is a coroutine function, and the losing task is simply cancelled"""
+        report = {} if report is None else report
+        model, tier, reason = self.choose(tokens, budget)
+        hedge_after = min([t for t in (self.slo, budget) if t] or [0])
+        if not self.fast:
+            return self._served(report, model, tier, reason, await self._timed_async(call, model, True))
+        if tier == "fast":
+            try:
+                result = await self._timed_async(call, model, True)
+            except Exception as e:
+                print(f"AI Error ({model}): {e}; falling back to {self.primary}")
+                return self._served(report, self.primary, "primary", "fallback", await self._timed_async(call, self.primary, True))
+            return self._served(report, model, tier, reason, result)
+
+        primary = asyncio.ensure_future(self._timed_async(call, model, True))
+        pending = {primary: (model, tier, "default")}
+        try:
+            try:
+                await asyncio.wait_for(asyncio.shield(primary), hedge_after or None)
+                return self._served(report, model, tier, reason, primary.result())
+            except asyncio.TimeoutError:
+                pass
+            except Exception as e:
+                print(f"AI Error ({model}): {e}; falling back to {self.fast}")
+                return self._served(report, self.fast, "fast", "fallback", await self._timed_async(call, self.fast, True))
+
+            report["hedged"] = True
+            metrics.LLM_HEDGES.inc()
+            pending[asyncio.ensure_future(self._timed_async(call, self.fast, False))] = (self.fast, "fast", "hedge")
+            error = None
+            while pending:
+                done, _ = await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    served_model, served_tier, served_reason = pending.pop(task)
+                    if task.exception() is None:
+                        return self._served(report, served_model, served_tier, served_reason, task.result())
+                    error = task.exception()
+            raise error
+        finally:
+            # The loser, or everything if the request itself was cancelled
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _served(report, model, tier, reason, result):
+        report.update(model=model, tier=tier, reason=reason)
+        report.setdefault("hedged", False)
+        metrics.LLM_TIER.labels(tier, reason).inc()
+        return result
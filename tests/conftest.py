@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "bench")]
+
+# app opens its SQLite stores at import; keep them out of the real temp dir
+_scratch = tempfile.mkdtemp(prefix="resume_tests_")
+os.environ.setdefault("GROQ_API_KEY", "test")
+for name, file in (("RESULT_CACHE_PATH", "results.sqlite3"), ("JOBS_DB_PATH", "jobs.sqlite3"),
+                   ("RATE_LIMIT_DB_PATH", "ratelimit.sqlite3")):
+    os.environ.setdefault(name, os.path.join(_scratch, file))
@@ -0,0 +1,39 @@
+"""A replaced logo reaches new PDFs, including ones that would otherwise come from the result cache"""
+import os
+
+import pytest
+from PIL import Image
+
+import app
+from layout import PageChrome
+
+
+@pytest.fixture
+def chrome(tmp_path, monkeypatch):
+    monkeypatch.setattr(PageChrome, "CHECK_INTERVAL", 0.0)
+    Image.new("RGB", (8, 4), "blue").save(tmp_path / "krify_logo.png")
+    return PageChrome(str(tmp_path))
+
+
+def _replace_logo(chrome):
+    path = os.path.join(chrome.static_dir, "krify_logo.png")
+    Image.new("RGB", (8, 4), "red").save(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_signature_follows_the_logo(chrome):
+    before = chrome.signature
+    assert before[0].endswith("krify_logo.png")
+    _replace_logo(chrome)
+    assert chrome.signature != before
+    os.remove(os.path.join(chrome.static_dir, "krify_logo.png"))
+    assert chrome.signature is None
+
+
+def test_cache_key_changes_with_the_logo(chrome, monkeypatch):
+    monkeypatch.setattr(app, "page_chrome", chrome)
+    before = app._cache_key(b"resume", "")
+    assert app._cache_key(b"resume", "") == before
+    _replace_logo(chrome)
+    assert app._cache_key(b"resume", "") != before
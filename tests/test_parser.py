@@ -0,0 +1,52 @@
+"""Line-format replies: the shapes the model actually produces"""
+import app
+
+
+def test_numbered_headings():
+    data = app.parse_ai_response("Full Name: Jane Doe\n1. PROFILE SUMMARY:\nGood dev\n"
+                                 "2) PROFESSIONAL EXPERIENCE:\nAcme | Engineer | 2020-2024\n")
+    assert data["Full Name"] == "Jane Doe"
+    assert data["Profile Summary"] == "Good dev"
+    assert data["Professional Experience"] == "Acme | Engineer | 2020-2024"
+
+
+def test_headings_without_colon():
+    data = app.parse_ai_response("## PROFILE SUMMARY\nGood dev\n**Technical Skills**\nPython, SQL\n")
+    assert data["Profile Summary"] == "Good dev"
+    assert data["Technical Skills"] == "Python, SQL"
+
+
+def test_heading_words_in_content_are_not_headings():
+    data = app.parse_ai_response("PROFILE SUMMARY:\nTechnical skills include Python\n")
+    assert data["Profile Summary"] == "Technical skills include Python"
+    assert data["Technical Skills"] == ""
+
+
+def test_contact_block_with_label_and_bullets():
+    data = app.parse_ai_response("Here is the resume:\nCANDIDATE INFORMATION:\n- Full Name: **Jane Doe**\n"
+                                 "- Email: jane@example.com\n\nPROFILE SUMMARY:\nGood dev\n")
+    assert data["Full Name"] == "Jane Doe"
+    assert data["Email"] == "jane@example.com"
+
+
+def test_contact_markers_in_body_are_content():
+    data = app.parse_ai_response("Email: jane@example.com\nPROFESSIONAL EXPERIENCE:\n"
+                                 "Acme | Engineer\n- Email: updates to customers\n")
+    assert data["Email"] == "jane@example.com"
+    assert data["Professional Experience"].endswith("- Email: updates to customers")
+
+
+def test_contact_markers_after_unrecognised_content_are_ignored():
+    # No heading was recognised, but the body has started all the same
+    data = app.parse_ai_response("Email: jane@example.com\n## WORK HISTORY\nAcme | Engineer\n"
+                                 "- Email: updates to customers\n")
+    assert data["Email"] == "jane@example.com"
+
+
+def test_streamed_chunks_match_whole_reply():
+    reply = "Full Name: Jane Doe\n1. PROFILE SUMMARY:\nGood dev\n2. TECHNICAL SKILLS\nPython\n"
+    parser = app.ResponseParser()
+    for i in range(0, len(reply), 5):
+        parser.feed(reply[i:i + 5])
+    assert parser.close() == app.parse_ai_response(reply)
+    assert parser.completed == ["Profile Summary", "Technical Skills"]
@@ -0,0 +1,40 @@
+"""compress_resume keeps to its token budget, whatever the line structure"""
+import random
+
+from preprocess import compress_resume, estimate_tokens
+
+WORDS = ["engineer", "built", "python", "services", "for", "customers", "data", "pipelines", "2019", "&"]
+
+
+def _words(count, seed=0):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def test_single_line_document_is_cut_to_budget():
+    line = _words(5000)
+    compressed = compress_resume(line, 1000)
+    assert 900 < estimate_tokens(compressed) <= 1000
+    assert line.startswith(compressed)
+
+
+def test_long_paragraph_is_truncated_not_dropped():
+    summary = _words(280, seed=1)
+    experience = "\n".join(f"- {_words(12, seed=i)}" for i in range(200))
+    text = f"Jane Doe\njane@example.com\nPROFILE SUMMARY\n{summary}\nPROFESSIONAL EXPERIENCE\n{experience}"
+    lines = compress_resume(text, 1000).splitlines()
+    assert estimate_tokens("\n".join(lines)) + len(lines) <= 1000
+    kept = lines[lines.index("PROFILE SUMMARY") + 1]
+    assert kept and summary.startswith(kept)
+    assert "PROFESSIONAL EXPERIENCE" in lines
+
+
+def test_cut_falls_on_a_word_boundary():
+    line = _words(3000, seed=2)
+    compressed = compress_resume(line, 500)
+    assert line[len(compressed)] == " "
+
+
+def test_text_within_budget_is_unchanged():
+    text = "Jane Doe\nPROFILE SUMMARY\nGood engineer"
+    assert compress_resume(text, 1000) == text
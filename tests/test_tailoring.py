@@ -0,0 +1,62 @@
+"""Tailored PDFs are cached under the job description only when the tailoring actually happened"""
+import io
+import json
+
+import pytest
+
+import app
+from corpus import make_pdf
+
+RECORD = dict({key: "" for key in app.ALL_FIELDS}, **{"Full Name": "Jane Doe", "Profile Summary": "Engineer",
+                                                       "Technical Skills": "Java, Python"})
+
+
+@pytest.fixture
+def replies(monkeypatch, tmp_path):
+    """Serve the extraction from RECORD and tailoring from the queued replies, with empty caches"""
+    queue = []
+
+    def run(call, tokens, budget=None, report=None):
+        report.update(model=app.GROQ_MODEL, tier="primary", reason="default", hedged=False)
+        return queue.pop(0)
+
+    monkeypatch.setattr(app.model_router, "run", run)
+    monkeypatch.setattr(app, "result_cache", app.ResultCache(str(tmp_path / "cache.sqlite3"), 1 << 24, 3600))
+    return queue
+
+
+@pytest.fixture
+def resume(tmp_path):
+    with open(make_pdf(str(tmp_path / "resume.pdf"), 1), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("reply", ["not json", "{}", json.dumps({"Profile Summary": "", "Technical Skills": "Python"})])
+def test_failed_tailoring_is_not_cached(replies, resume, reply):
+    good = json.dumps({"Profile Summary": "Python **engineer**", "Technical Skills": "Python, Java"})
+    replies += [dict(RECORD), reply, good]
+    app.convert_document(resume, "resume.pdf", "Python role")
+    report = {}
+    app.convert_document(resume, "resume.pdf", "Python role", report=report)
+    assert report["tier"] == "cache" and report["reason"] == "extraction_cache"
+    assert report["tailor"]["reason"] == "default" and not report["tailor"]["incomplete"]
+
+
+def test_tailored_pdf_is_cached(replies, resume):
+    replies += [dict(RECORD), json.dumps({"Profile Summary": "Python **engineer**", "Technical Skills": "Python, Java"})]
+    app.convert_document(resume, "resume.pdf", "Python role")
+    report = {}
+    app.convert_document(resume, "resume.pdf", "Python role", report=report)
+    assert report == {"tier": "cache", "reason": "cache", "hedged": False}
+
+
+def test_headers_name_the_tailoring_model(replies, resume):
+    good = json.dumps({"Profile Summary": "Python **engineer**", "Technical Skills": "Python, Java"})
+    replies += [dict(RECORD), good, good]
+    client = app.app.test_client()
+    for job_description in ("Python role", "Java role"):
+        response = client.post("/convert", data={"candidate_resume": (io.BytesIO(resume), "resume.pdf"),
+                                                 "job_description": job_description})
+    assert response.headers["X-Model-Tier"] == "cache"
+    assert response.headers["X-Tailor-Tier"] == "primary"
+    assert response.headers["X-Tailor-Model"] == app.GROQ_MODEL
@@ -0,0 +1,42 @@
+"""Uploads reach the extractors as the file objects werkzeug hands the views (runtime.txt pins Python 3.10)"""
+import contextlib
+import io
+import zipfile
+
+import pytest
+
+import app
+from corpus import make_docx, make_pdf
+from extraction import extract_text
+
+
+@contextlib.contextmanager
+def _upload(path, name, field="candidate_resume"):
+    """The upload's stream as a view sees it; it is closed with the request"""
+    with open(path, "rb") as f:
+        data = f.read()
+    with app.app.test_request_context("/convert", method="POST", data={field: (io.BytesIO(data), name)}):
+        yield app.request.files[field].stream
+
+
+@pytest.fixture(params=[True, False], ids=["in_memory", "spilled"])
+def in_memory(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(app, "UPLOAD_SPOOL_BYTES", 0)
+    return request.param
+
+
+@pytest.mark.parametrize("maker, name", [(make_pdf, "resume.pdf"), (make_docx, "resume.docx")])
+def test_upload_is_extracted(tmp_path, in_memory, maker, name):
+    with _upload(maker(str(tmp_path / name), 1), name) as stream:
+        assert isinstance(stream, io.BytesIO) == in_memory
+        assert "Jane Candidate" in extract_text(stream, name)
+
+
+def test_zip_upload_entries_are_read(tmp_path, in_memory):
+    archive = tmp_path / "batch.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.write(make_pdf(str(tmp_path / "a.pdf"), 1), "a.pdf")
+    with _upload(archive, "batch.zip", "resume_zip") as stream, zipfile.ZipFile(stream) as zf:
+        data = app._read_entry(zf, zf.getinfo("a.pdf"))
+    assert "Jane Candidate" in extract_text(io.BytesIO(data), "a.pdf")